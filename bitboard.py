@@ -0,0 +1,112 @@
+"""Bitboard rules backend.
+
+Each colour's pawns are kept as integer occupancy masks: bits 0-51 are the main
+path squares in absolute (board) indices and bits 52-57 the colour's own home
+stretch. Move generation works on the same masks rotated so the colour's start
+square is bit 0, which turns "advance every pawn by the dice" into one shift.
+"""
+
+from engine import COLORS, MAIN_PATH_VISUAL_MAP, START_PATH_INDEX, HOME_STRETCH_VISUAL_MAP, SAFE_SQUARES_COORDS, GameLogic
+
+PATH_LENGTH = 52
+HOME_STRETCH_LENGTH = len(HOME_STRETCH_VISUAL_MAP["red"])
+FINISH_STEP = PATH_LENGTH + HOME_STRETCH_LENGTH
+HOME_STEP = -1
+ENTRY_STEP = 5  # Leaving home on a 6 lands five squares past the start square.
+
+MAIN_MASK = (1 << PATH_LENGTH) - 1
+HOME_STRETCH_MASK = ((1 << HOME_STRETCH_LENGTH) - 1) << PATH_LENGTH
+TRACK_MASK = (1 << (FINISH_STEP + 1)) - 1
+
+SAFE_MASK = 0
+for _idx, _coords in MAIN_PATH_VISUAL_MAP.items():
+    if _coords in SAFE_SQUARES_COORDS:
+        SAFE_MASK |= 1 << _idx
+
+
+def rotate_to_relative(mask, color):
+    start = START_PATH_INDEX[color]
+    main = mask & MAIN_MASK
+    return (((main >> start) | (main << (PATH_LENGTH - start))) & MAIN_MASK) | (mask & HOME_STRETCH_MASK)
+
+
+# Per colour: safe squares seen from the colour's start, and the step <-> logical position tables.
+SAFE_RELATIVE_MASK = {color: rotate_to_relative(SAFE_MASK, color) for color in COLORS}
+POSITION_OF_STEP = {}
+STEP_OF_POSITION = {}
+for _color in COLORS:
+    _start = START_PATH_INDEX[_color]
+    _positions = [("main_path", (_start + step) % PATH_LENGTH) for step in range(PATH_LENGTH)]
+    _positions += [("home_stretch", idx) for idx in range(HOME_STRETCH_LENGTH)]
+    _positions.append("finished")
+    POSITION_OF_STEP[_color] = _positions
+    STEP_OF_POSITION[_color] = {pos: step for step, pos in enumerate(_positions)}
+    STEP_OF_POSITION[_color]["home"] = HOME_STEP
+
+
+class BitboardGameLogic(GameLogic):
+    def __init__(self, seed=None):
+        self.steps = {color: [HOME_STEP] * 4 for color in COLORS}
+        self.occupancy = {color: 0 for color in COLORS}
+        super().__init__(seed)
+
+    def _place(self, pawn, position):
+        super()._place(pawn, position)
+        steps = self.steps[pawn.color]
+        steps[pawn.pawn_id] = STEP_OF_POSITION[pawn.color][position]
+
+        start = START_PATH_INDEX[pawn.color]
+        occupancy = 0
+        for step in steps:
+            if step < 0 or step == FINISH_STEP:
+                continue
+            if step < PATH_LENGTH:
+                occupancy |= 1 << ((start + step) % PATH_LENGTH)
+            else:
+                occupancy |= 1 << step
+        self.occupancy[pawn.color] = occupancy
+
+    def movable_mask(self, color, dice_roll):
+        """Returns a 4-bit mask of the pawn ids of `color` that can move `dice_roll` squares."""
+        relative = rotate_to_relative(self.occupancy[color], color)
+        blocked = relative & MAIN_MASK & ~SAFE_RELATIVE_MASK[color]
+        sources = ((relative << dice_roll) & TRACK_MASK & ~blocked) >> dice_roll
+        can_enter = dice_roll == 6 and not (blocked >> ENTRY_STEP) & 1
+
+        mask = 0
+        for pawn_id, step in enumerate(self.steps[color]):
+            if step == HOME_STEP:
+                if can_enter:
+                    mask |= 1 << pawn_id
+            elif step != FINISH_STEP and (sources >> step) & 1:
+                mask |= 1 << pawn_id
+        return mask
+
+    def _get_valid_moves(self, player, dice_roll):
+        mask = self.movable_mask(player.color, dice_roll)
+        return [pawn for pawn in player.pawns if (mask >> pawn.pawn_id) & 1]
+
+    def _calculate_destination(self, pawn, steps):
+        step = self.steps[pawn.color][pawn.pawn_id]
+        if step == HOME_STEP:
+            return POSITION_OF_STEP[pawn.color][ENTRY_STEP] if steps == 6 else None
+        if step == FINISH_STEP:
+            # The reference walker stays on "finished" for a single step.
+            return "finished" if steps == 1 else None
+        if step + steps > FINISH_STEP:
+            return None
+        return POSITION_OF_STEP[pawn.color][step + steps]
+
+    def _find_capture(self, pawn):
+        position = pawn.position
+        if position == "finished" or position[0] != "main_path":
+            return None
+        square_bit = 1 << position[1]
+        if SAFE_MASK & square_bit:
+            return None
+        for other_color in COLORS:
+            if other_color != pawn.color and self.occupancy[other_color] & square_bit:
+                for other_pawn in self.players[other_color].pawns:
+                    if other_pawn.position == position:
+                        return other_pawn
+        return None
@@ -0,0 +1,130 @@
+"""Computer players.
+
+`choose_move` is the entry point used by the GUI's process pool: it rebuilds a
+game from a GameSnapshot and searches it until the time budget runs out. The
+search works in place on one GameLogic through move_pawn/unmake, without
+publishing snapshots, so it never copies the game.
+"""
+
+import random
+import time
+
+from engine import COLORS, GameLogic
+from bitboard import STEP_OF_POSITION, FINISH_STEP, HOME_STEP
+
+WIN_SCORE = 10000
+
+
+def game_from_snapshot(snapshot, engine=GameLogic):
+    game = engine()
+    for pawn_state in snapshot.pawns:
+        game._place(game.players[pawn_state.color].pawns[pawn_state.pawn_id], pawn_state.position)
+    game.current_player_idx = game.player_order.index(snapshot.current_color)
+    game.dice_roll = snapshot.dice_roll
+    game.movable_pawns = [game.players[p.color].pawns[p.pawn_id] for p in snapshot.movable_pawns]
+    game._publish()
+    return game
+
+
+def evaluate(game, color):
+    """Scores the position for `color`: its track progress minus the best opponent's."""
+    scores = {}
+    for other_color, player in game.players.items():
+        score = 0
+        for pawn in player.pawns:
+            step = STEP_OF_POSITION[other_color][pawn.position]
+            if step == HOME_STEP:
+                continue
+            score += 10 + step
+            if step == FINISH_STEP:
+                score += 20
+        scores[other_color] = score
+    if game.check_win_condition(game.players[color]):
+        return WIN_SCORE
+    return scores.pop(color) - max(scores.values())
+
+
+def random_choice(game, rng=random):
+    return rng.choice(game.movable_pawns)
+
+
+def greedy_choice(game):
+    """Picks the movable pawn whose move gives the best immediate evaluation."""
+    color = game.get_current_player().color
+    best_pawn, best_score = None, None
+    for pawn in list(game.movable_pawns):
+        record = game.move_pawn(pawn, publish=False)
+        score = evaluate(game, color)
+        if record.captured_pawn:
+            score += 15
+        game.unmake(record, publish=False)
+        if best_score is None or score > best_score:
+            best_pawn, best_score = pawn, score
+    return best_pawn
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def _expectimax(game, color, depth, deadline):
+    """Averages over the next roll of the player to move; that player picks its best move."""
+    if depth == 0:
+        return evaluate(game, color)
+    if time.monotonic() > deadline:
+        raise SearchTimeout()
+
+    player = game.get_current_player()
+    saved_dice, saved_movable = game.dice_roll, game.movable_pawns
+    total = 0
+    for dice in range(1, 7):
+        game.dice_roll = dice
+        game.movable_pawns = game._get_valid_moves(player, dice)
+        if not game.movable_pawns:
+            total += evaluate(game, color)
+            continue
+        values = []
+        for pawn in list(game.movable_pawns):
+            values.append(_search_move(game, pawn, color, depth, deadline))
+        total += max(values) if player.color == color else min(values)
+    game.dice_roll, game.movable_pawns = saved_dice, saved_movable
+    return total / 6
+
+
+def _search_move(game, pawn, color, depth, deadline):
+    record = game.move_pawn(pawn, publish=False)
+    try:
+        if game.check_win_condition(game.players[pawn.color]):
+            return WIN_SCORE if pawn.color == color else -WIN_SCORE
+        game.advance_turn(publish=False)
+        return _expectimax(game, color, depth - 1, deadline)
+    finally:
+        game.unmake(record, publish=False)
+
+
+def search_choice(game, deadline, max_depth=None):
+    """Iterative deepening expectimax; returns the best pawn of the deepest finished search."""
+    color = game.get_current_player().color
+    best_pawn = greedy_choice(game)
+    depth = 1
+    while time.monotonic() < deadline and (max_depth is None or depth <= max_depth):
+        try:
+            scored = [(_search_move(game, pawn, color, depth, deadline), pawn.pawn_id, pawn)
+                      for pawn in list(game.movable_pawns)]
+        except SearchTimeout:
+            break
+        best_pawn = max(scored, key=lambda item: (item[0], -item[1]))[2]
+        depth += 1
+    return best_pawn
+
+
+def choose_move(snapshot, time_budget):
+    """Worker-process entry point: returns the pawn_id to move for `snapshot`."""
+    deadline = time.monotonic() + time_budget
+    game = game_from_snapshot(snapshot)
+    return search_choice(game, deadline).pawn_id
+
+
+def warm_up():
+    # Submitted once when the pool starts so the first real move doesn't pay for the imports.
+    return len(COLORS)
@@ -0,0 +1,379 @@
+"""Ludo rules and board tables, without any GUI.
+
+Headless tools and worker processes import this module instead of final.py, so
+they don't pay for tkinter. The board maps are written out as literals; only
+the per-colour track tables (TRACK_COORDS, TRACK_INDEX) are derived from them
+by a short loop over the four colours at import time.
+"""
+
+import random
+import zlib
+from collections import namedtuple
+
+COLORS = ["red", "green", "yellow", "blue"]
+SQUARE_SIZE = 40
+BOARD_GRID_SIZE = 15
+
+MAIN_PATH_VISUAL_MAP = {
+    0: (6, 1), 1: (6, 2), 2: (6, 3), 3: (6, 4), 4: (6, 5),
+    5: (5, 6), 6: (4, 6), 7: (3, 6), 8: (2, 6), 9: (1, 6),
+    10: (0, 6), 11: (0, 7), 12: (0, 8), 13: (1, 8), 14: (2, 8),
+    15: (3, 8), 16: (4, 8), 17: (5, 8), 18: (6, 9), 19: (6, 10),
+    20: (6, 11), 21: (6, 12), 22: (6, 13), 23: (6, 14), 24: (7, 14),
+    25: (8, 14), 26: (8, 13), 27: (8, 12), 28: (8, 11), 29: (8, 10),
+    30: (8, 9), 31: (9, 8), 32: (10, 8), 33: (11, 8), 34: (12, 8),
+    35: (13, 8), 36: (14, 8), 37: (14, 7), 38: (14, 6), 39: (13, 6),
+    40: (12, 6), 41: (11, 6), 42: (10, 6), 43: (9, 6), 44: (8, 5),
+    45: (8, 4), 46: (8, 3), 47: (8, 2), 48: (8, 1), 49: (8, 0),
+    50: (7, 0), 51: (6, 0)
+}
+
+START_PATH_INDEX = {
+    "red": 48, "green": 9, "yellow": 22, "blue": 35,
+}
+
+HOME_STRETCH_VISUAL_MAP = {
+    "red": [(7, 1), (7, 2), (7, 3), (7, 4), (7, 5), (7, 6)],
+    "green": [(1, 7), (2, 7), (3, 7), (4, 7), (5, 7), (6, 7)],
+    "yellow": [(7, 13), (7, 12), (7, 11), (7, 10), (7, 9), (7, 8)],
+    "blue": [(13, 7), (12, 7), (11, 7), (10, 7), (9, 7), (8, 7)],
+}
+
+LAST_MAIN_SQUARE_BEFORE_HOME = {
+    "red": 47,
+    "green": 8,
+    "yellow": 21,
+    "blue": 34
+}
+
+SAFE_SQUARES_COORDS = [
+    (8, 1), (1, 6), (6, 13), (13, 8),  # start squares
+    (6, 5), (5, 8), (8, 9), (9, 6),  # main path 4, 17, 30 and 43
+]
+
+# Each colour's full visual track, indexed by steps since leaving home: its start square and the
+# rest of the 52-square loop, then its home stretch, then the centre. Moves are slices of it.
+TRACK_COORDS = {}
+TRACK_INDEX = {}
+for _color in COLORS:
+    _start = START_PATH_INDEX[_color]
+    _positions = [("main_path", (_start + _step) % 52) for _step in range(52)]
+    _positions += [("home_stretch", _idx) for _idx in range(len(HOME_STRETCH_VISUAL_MAP[_color]))]
+    TRACK_COORDS[_color] = [MAIN_PATH_VISUAL_MAP[_idx] for _, _idx in _positions[:52]] + HOME_STRETCH_VISUAL_MAP[_color] + [(7.5, 7.5)]
+    TRACK_INDEX[_color] = {_pos: _step for _step, _pos in enumerate(_positions + ["finished"])}
+
+# Read-only views of the game published after every mutation.
+PawnState = namedtuple("PawnState", ["color", "pawn_id", "position"])
+GameSnapshot = namedtuple("GameSnapshot", ["pawns", "current_color", "dice_roll", "movable_pawns"])
+
+# Everything move_pawn changed, so GameLogic.unmake can put it back.
+MoveRecord = namedtuple("MoveRecord", [
+    "pawn", "old_position", "captured_pawn", "captured_old_position",
+    "current_player_idx", "dice_roll", "movable_pawns",
+])
+
+class Pawn:
+    def __init__(self, color, pawn_id):
+        self.color = color
+        self.pawn_id = pawn_id
+        self.position = "home"
+
+class Player:
+    def __init__(self, color):
+        self.color = color
+        self.pawns = [Pawn(color, i) for i in range(4)]
+
+class GameLogic:
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.players = {color: Player(color) for color in COLORS}
+        self.player_order = COLORS
+        self.current_player_idx = 0
+        self.dice_roll = 0
+        self.movable_pawns = []
+        self.initial_pawn_home_coords = {
+            "green":  [(2, 2), (3, 2), (2, 3), (3, 3)],
+            "red":    [(11, 2), (12, 2), (11, 3), (12, 3)],
+            "yellow": [(2, 11), (3, 11), (2, 12), (3, 12)],
+            "blue":   [(11, 11), (12, 11), (11, 12), (12, 12)],
+        }
+        self.listeners = []
+        self.snapshot = None
+        self._publish()
+
+    def subscribe(self, listener):
+        """Registers listener(kind, **details) for "dice_rolled", "pawn_moved", "pawn_captured" and "turn_changed".
+
+        Listeners run on the thread that changed the game, usually while it holds the game lock.
+        """
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def _emit(self, kind, **details):
+        for listener in self.listeners:
+            listener(kind, **details)
+
+    def _pawn_state(self, pawn):
+        return PawnState(pawn.color, pawn.pawn_id, pawn.position)
+
+    def _publish(self):
+        # Readers take self.snapshot without the lock; rebinding one attribute is atomic,
+        # so they always see a complete state from before or after a mutation.
+        pawns = tuple(
+            PawnState(pawn.color, pawn.pawn_id, pawn.position)
+            for color in COLORS for pawn in self.players[color].pawns
+        )
+        movable = tuple(pawns[COLORS.index(pawn.color) * 4 + pawn.pawn_id] for pawn in self.movable_pawns)
+        self.snapshot = GameSnapshot(pawns, self.player_order[self.current_player_idx], self.dice_roll, movable)
+
+    def get_current_player(self):
+        return self.players[self.player_order[self.current_player_idx]]
+
+    def roll_dice(self, publish=True):
+        """Rolls for the current player and returns (dice value, movable pawns).
+
+        Headless loops that never read self.snapshot pass publish=False here and to
+        move_pawn/advance_turn; the snapshot then stays at the last published state.
+        """
+        # Built on random() alone, whose output for a given seed is the same on every platform
+        # and Python version (randint's is not guaranteed), so seeded games replay bit for bit.
+        self.dice_roll = int(self.rng.random() * 6) + 1
+        player = self.get_current_player()
+        self.movable_pawns = self._get_valid_moves(player, self.dice_roll)
+        if publish:
+            self._publish()
+            if self.listeners:
+                self._emit("dice_rolled", color=player.color, value=self.dice_roll, movable_pawns=self.snapshot.movable_pawns)
+        return self.dice_roll, self.movable_pawns
+
+    def _get_valid_moves(self, player, dice_roll):
+        valid_pawns = []
+        for pawn in player.pawns:
+            if pawn.position == "finished":
+                continue
+
+            if pawn.position == "home" and dice_roll != 6:
+                continue
+            
+            destination = self._calculate_destination(pawn, dice_roll)
+            if destination is None:
+                continue
+
+            is_blocked = False
+            if destination != "finished":
+                is_dest_safe = False
+                if destination[0] == "main_path":
+                    dest_coords = MAIN_PATH_VISUAL_MAP[destination[1]]
+                    if dest_coords in SAFE_SQUARES_COORDS:
+                        is_dest_safe = True
+                
+                if not is_dest_safe and destination[0] != "home_stretch":
+                    for other_pawn in player.pawns:
+                        if other_pawn != pawn and other_pawn.position == destination:
+                            is_blocked = True
+                            break
+            
+            if not is_blocked:
+                valid_pawns.append(pawn)
+
+        return valid_pawns
+
+    def _get_next_logical_pos(self, color, current_pos):
+        if current_pos == "finished":
+            return "finished"
+        
+        path_length = 52
+        home_stretch_len = len(HOME_STRETCH_VISUAL_MAP[color])
+
+        if current_pos[0] == "home_stretch":
+            current_idx = current_pos[1]
+            if current_idx + 1 < home_stretch_len:
+                return ("home_stretch", current_idx + 1)
+            else:
+                return "finished"
+        
+        if current_pos[0] == "main_path":
+            current_idx = current_pos[1]
+            
+            # The turn-off point is the square right before the player's starting square.
+            turn_off_square = (START_PATH_INDEX[color] - 1 + path_length) % path_length
+            if current_idx == turn_off_square:
+                return ("home_stretch", 0)
+            else:
+                next_idx = (current_idx + 1) % path_length
+                return ("main_path", next_idx)
+        
+        return None
+
+    def _calculate_destination(self, pawn, steps):
+        if pawn.position == "home":
+            if steps != 6:
+                return None
+            current_pos = ("main_path", START_PATH_INDEX[pawn.color])
+            steps_to_move = steps - 1
+        else:
+            current_pos = pawn.position
+            steps_to_move = steps
+
+        for i in range(steps_to_move):
+            current_pos = self._get_next_logical_pos(pawn.color, current_pos)
+            if current_pos is None:
+                return None
+            if current_pos == "finished" and i < steps_to_move - 1:
+                return None
+        
+        return current_pos
+
+    def get_track_span(self, pawn, steps):
+        """Returns the (first, last) TRACK_COORDS indices a move walks through; first is -1 when leaving home."""
+        if pawn.position == "home":
+            return (-1, steps - 1) if steps == 6 else None
+        first = TRACK_INDEX[pawn.color][pawn.position]
+        return first, min(first + steps, len(TRACK_COORDS[pawn.color]) - 1)
+
+    def get_pawn_path_waypoints(self, pawn, steps):
+        span = self.get_track_span(pawn, steps)
+        if span is None:
+            return []
+        first, last = span
+        track = TRACK_COORDS[pawn.color]
+        if first < 0:
+            return [self.get_visual_coords(pawn)] + track[:last + 1]
+        return track[first:last + 1]
+
+    def get_visual_coords_for_logical_pos(self, pawn_color, logical_pos):
+        if logical_pos[0] == "main_path":
+            return MAIN_PATH_VISUAL_MAP[logical_pos[1]]
+        elif logical_pos[0] == "home_stretch":
+            return HOME_STRETCH_VISUAL_MAP[pawn_color][logical_pos[1]]
+        return (0,0)
+
+    def move_pawn(self, pawn, publish=True):
+        """Moves `pawn` by the current dice and returns a MoveRecord for unmake.
+
+        Search passes publish=False: the snapshot is not rebuilt and listeners are not
+        told, so a subscribed game can be searched in place. Both stay as they were
+        until the matching unmake restores that state.
+        """
+        old_position = pawn.position
+        new_position = self._calculate_destination(pawn, self.dice_roll)
+
+        if new_position:
+            self._place(pawn, new_position)
+        
+        captured_pawn = self._find_capture(pawn)
+        captured_old_position = None
+        if captured_pawn:
+            captured_old_position = captured_pawn.position
+            self._place(captured_pawn, "home")
+        
+        if publish:
+            self._publish()
+            if self.listeners:
+                if new_position:
+                    self._emit("pawn_moved", pawn=self._pawn_state(pawn), old_position=old_position)
+                if captured_pawn:
+                    self._emit("pawn_moved", pawn=self._pawn_state(captured_pawn), old_position=captured_old_position)
+                    self._emit("pawn_captured", pawn=self._pawn_state(captured_pawn), by=self._pawn_state(pawn))
+        return MoveRecord(pawn, old_position, captured_pawn, captured_old_position,
+                          self.current_player_idx, self.dice_roll, self.movable_pawns)
+
+    def unmake(self, record, publish=True):
+        """Reverts a move_pawn call (and any turn change after it) using its MoveRecord."""
+        moved_from = record.pawn.position
+        if record.captured_pawn:
+            self._place(record.captured_pawn, record.captured_old_position)
+        self._place(record.pawn, record.old_position)
+        turn_changed = self.current_player_idx != record.current_player_idx
+        self.current_player_idx = record.current_player_idx
+        self.dice_roll = record.dice_roll
+        self.movable_pawns = record.movable_pawns
+        if publish:
+            self._publish()
+            if self.listeners:
+                if record.captured_pawn:
+                    self._emit("pawn_moved", pawn=self._pawn_state(record.captured_pawn), old_position="home")
+                self._emit("pawn_moved", pawn=self._pawn_state(record.pawn), old_position=moved_from)
+                if turn_changed:
+                    self._emit("turn_changed", color=self.player_order[self.current_player_idx])
+
+    def _place(self, pawn, position):
+        # Every position change goes through here so alternate backends can keep derived state in sync.
+        # It raises no events: the public methods that call it announce their changes once published.
+        pawn.position = position
+
+    def _find_capture(self, pawn):
+        if pawn.position != "finished" and pawn.position[0] == "main_path":
+            current_pawn_visual_coords = MAIN_PATH_VISUAL_MAP[pawn.position[1]]
+
+            if current_pawn_visual_coords not in SAFE_SQUARES_COORDS:
+                for other_color in COLORS:
+                    if other_color == pawn.color: continue
+                    for other_pawn in self.players[other_color].pawns:
+                        if other_pawn.position == pawn.position:
+                            return other_pawn
+        return None
+
+    def next_player(self, publish=True):
+        self.current_player_idx = (self.current_player_idx + 1) % len(self.player_order)
+        if publish:
+            self._publish()
+            if self.listeners:
+                self._emit("turn_changed", color=self.player_order[self.current_player_idx])
+
+    def advance_turn(self, publish=True):
+        """Passes the turn unless the last roll was a 6. Returns True if the same player rolls again."""
+        if self.dice_roll == 6:
+            return True
+        self.next_player(publish)
+        return False
+
+    def get_visual_coords(self, pawn):
+        pos = pawn.position
+        if pos == "home":
+            return self.initial_pawn_home_coords[pawn.color][pawn.pawn_id]
+        if pos == "finished":
+            return (7.5, 7.5) 
+        if pos[0] == "main_path":
+            return MAIN_PATH_VISUAL_MAP[pos[1]]
+        if pos[0] == "home_stretch":
+            return HOME_STRETCH_VISUAL_MAP[pawn.color][pos[1]]
+        return (0, 0)
+
+    def check_win_condition(self, player):
+        return all(pawn.position == "finished" for pawn in player.pawns)
+
+    def state_checksum(self):
+        snapshot = self.snapshot
+        canonical = repr((tuple(pawn.position for pawn in snapshot.pawns), snapshot.current_color, snapshot.dice_roll))
+        return zlib.crc32(canonical.encode())
+
+    def export_state(self):
+        """Returns the full game state, dice generator included, as JSON-serialisable data."""
+        version, internal_state, gauss_next = self.rng.getstate()
+        return {
+            # Read from the pawns, not self.snapshot, which may be behind after publish=False calls.
+            "positions": [pawn.position for color in COLORS for pawn in self.players[color].pawns],
+            "current_player_idx": self.current_player_idx,
+            "dice_roll": self.dice_roll,
+            "rng": [version, list(internal_state), gauss_next],
+        }
+
+    def load_state(self, state):
+        pawns = [pawn for color in COLORS for pawn in self.players[color].pawns]
+        old_positions = [pawn.position for pawn in pawns]
+        for pawn, position in zip(pawns, state["positions"]):
+            if not isinstance(position, str):
+                position = tuple(position)
+            self._place(pawn, position)
+        self.current_player_idx = state["current_player_idx"]
+        self.dice_roll = state["dice_roll"]
+        self.movable_pawns = self._get_valid_moves(self.get_current_player(), self.dice_roll) if self.dice_roll else []
+        version, internal_state, gauss_next = state["rng"]
+        self.rng.setstate((version, tuple(internal_state), gauss_next))
+        self._publish()
+        if self.listeners:
+            for pawn, old_position in zip(pawns, old_positions):
+                self._emit("pawn_moved", pawn=self._pawn_state(pawn), old_position=old_position)
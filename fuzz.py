@@ -0,0 +1,172 @@
+"""Differential fuzzing of rules backends against the reference GameLogic.
+
+A fuzz game is a list of turns `(dice, choice)`: the dice value is forced on
+every engine, and the moved pawn is `movable_pawns[choice % len(movable_pawns)]`,
+so the same list stays playable after turns are removed. After every turn the
+engines must agree on the movable pawns, the destination of each of the
+player's pawns, the captured pawn, the win check, the resulting positions and
+the player to move. Games run without publishing snapshots.
+
+Games run in batches on a process pool, each with a seed derived from the fuzz
+seed and its game number. A diverging game is shrunk (delta debugging over its
+turns, then simplifying dice and choices) to a short sequence that still
+diverges, and printed so it can be replayed with `--replay`:
+
+    python fuzz.py 1000000 --workers 8
+    python fuzz.py --replay "[[6, 0], [3, 0]]"
+"""
+
+import argparse
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from engine import COLORS, GameLogic
+from bitboard import BitboardGameLogic
+from variants import VariantGameLogic
+
+ENGINES = {
+    "bitboard": BitboardGameLogic,
+    "variant-default": VariantGameLogic,
+}
+
+MAX_TURNS = 2000
+SMALL_CHUNK = 8
+
+
+def game_seed(base_seed, game_id):
+    return random.Random(f"{base_seed}:{game_id}").getrandbits(32)
+
+
+def random_turns(seed, max_turns=MAX_TURNS):
+    rng = random.Random(seed)
+    return [(int(rng.random() * 6) + 1, rng.randrange(4)) for _ in range(max_turns)]
+
+
+def _observe(game, turn):
+    """Plays one forced turn on `game` and returns everything the engines have to agree on."""
+    dice, choice = turn
+    player = game.get_current_player()
+    game.dice_roll = dice
+    game.movable_pawns = game._get_valid_moves(player, dice)
+    observed = {
+        "movable": [pawn.pawn_id for pawn in game.movable_pawns],
+        "destinations": [game._calculate_destination(pawn, dice) for pawn in player.pawns],
+    }
+    won = False
+    if game.movable_pawns:
+        record = game.move_pawn(game.movable_pawns[choice % len(game.movable_pawns)], publish=False)
+        captured = record.captured_pawn
+        observed["captured"] = (captured.color, captured.pawn_id) if captured else None
+        won = game.check_win_condition(player)
+        observed["won"] = won
+    if not won:
+        game.advance_turn(publish=False)
+    observed["pawns"] = [(color, pawn.pawn_id, pawn.position) for color in COLORS for pawn in game.players[color].pawns]
+    observed["current_player"] = game.current_player_idx
+    return observed, won
+
+
+def _describe(expected, actual):
+    details = {}
+    for key in sorted(expected.keys() | actual.keys()):
+        if key == "pawns" and expected[key] != actual[key]:
+            # All sixteen pawns at once are unreadable; only the ones that differ are shown.
+            details["pawns"] = [(want, got) for want, got in zip(expected[key], actual[key]) if want != got]
+        elif expected.get(key) != actual.get(key):
+            details[key] = (expected.get(key), actual.get(key))
+    return details
+
+
+def find_divergence(turns, engine):
+    """Returns (turn index, description) of the first turn where `engine` disagrees with GameLogic, or None."""
+    reference, candidate = GameLogic(), engine()
+    for idx, turn in enumerate(turns):
+        expected, won = _observe(reference, turn)
+        actual, _ = _observe(candidate, turn)
+        if actual != expected:
+            return idx, f"turno {idx} {turn}: {_describe(expected, actual)}"
+        if won:
+            return None
+    return None
+
+
+def shrink(turns, engine):
+    """Shrinks a diverging turn list to a (locally) minimal one that still diverges."""
+    def diverges(candidate):
+        return find_divergence(candidate, engine) is not None
+
+    turns = list(turns[:find_divergence(turns, engine)[0] + 1])
+    # ddmin: remove ever smaller chunks while the game still diverges. Small chunks are all tried,
+    # since whole rounds (one turn per player) often only go away together.
+    chunk = len(turns) // 2
+    while chunk >= 1:
+        start = 0
+        while start < len(turns):
+            candidate = turns[:start] + turns[start + chunk:]
+            if candidate and diverges(candidate):
+                turns = candidate
+            else:
+                start += 1 if chunk <= SMALL_CHUNK else chunk
+        chunk = chunk - 1 if chunk <= SMALL_CHUNK else chunk // 2
+    # Then make the remaining turns as plain as possible: lowest choice, then lowest dice.
+    for idx in range(len(turns)):
+        dice, choice = turns[idx]
+        for simpler in [(dice, 0)] + [(value, turns[idx][1]) for value in range(1, dice)]:
+            candidate = turns[:idx] + [simpler] + turns[idx + 1:]
+            if simpler != turns[idx] and diverges(candidate):
+                turns = candidate
+    return turns
+
+
+def fuzz_batch(engine_name, seed, game_ids):
+    """Worker entry point: returns (game_id, turns) of every diverging game of the batch."""
+    engine = ENGINES[engine_name]
+    failures = []
+    for game_id in game_ids:
+        turns = random_turns(game_seed(seed, game_id))
+        found = find_divergence(turns, engine)
+        if found is not None:
+            failures.append((game_id, turns[:found[0] + 1]))
+    return failures
+
+
+def run(num_games, engine_name="bitboard", seed=0, workers=None, batch_size=500, max_failures=1):
+    """Fuzzes `num_games` games and returns the shrunk turn lists of up to `max_failures` diverging games."""
+    engine = ENGINES[engine_name]
+    batches = [range(start, min(start + batch_size, num_games)) for start in range(0, num_games, batch_size)]
+    failures = []
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(fuzz_batch, engine_name, seed, game_ids) for game_ids in batches]
+        for future in as_completed(futures):
+            failures.extend(future.result())
+            if len(failures) >= max_failures:
+                for pending in futures:
+                    pending.cancel()
+                break
+    failures.sort()
+    return [(game_id, shrink(turns, engine)) for game_id, turns in failures[:max_failures]]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara motores de regras com o GameLogic de referência.")
+    parser.add_argument("games", type=int, nargs="?", default=100000)
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="bitboard")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--max-failures", type=int, default=1)
+    parser.add_argument("--replay", help="lista JSON de turnos [dado, escolha] a reproduzir")
+    args = parser.parse_args()
+
+    if args.replay:
+        found = find_divergence([tuple(turn) for turn in json.loads(args.replay)], ENGINES[args.engine])
+        print(found[1] if found else "Sem divergência.")
+    else:
+        failures = run(args.games, args.engine, args.seed, args.workers, args.batch_size, args.max_failures)
+        for game_id, turns in failures:
+            print(f"Partida {game_id} diverge; sequência mínima ({len(turns)} turnos):")
+            print(json.dumps([list(turn) for turn in turns]))
+            print(find_divergence(turns, ENGINES[args.engine])[1])
+        if not failures:
+            print(f"{args.games} partidas sem divergência.")
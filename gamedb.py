@@ -0,0 +1,214 @@
+"""Archive of finished games with mmap-backed reads and secondary indexes.
+
+A database `games` is three files:
+
+* `games.summaries` - an 8-byte magic followed by fixed-size SUMMARY records
+  (winner, turns, move count, offset into the move stream, capture squares).
+* `games.moves` - one byte per turn: colour << 6 | dice << 3 | (pawn_id + 1),
+  with pawn bits 0 when the roll allowed no move.
+* `games.index` - built by `build_indexes` in one pass over the summaries:
+  game numbers grouped by winner and by capture square, and game numbers
+  sorted by length. A JSON header gives each section's offset and length.
+
+Readers `mmap` all three files, so a query only touches the index pages it
+needs plus the records it returns.
+
+    with GameDatabaseWriter("games") as writer:
+        writer.add_events(stats.play_games(100000, seed=1))
+    build_indexes("games")
+    db = GameDatabase("games")
+    long_red_wins = set(db.games_won_by("red")) & set(db.games_longer_than(200))
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections import namedtuple
+
+from engine import COLORS, GameLogic
+
+PATH_LENGTH = 52
+MAGIC = b"LUDODB1\0"
+SUMMARY = struct.Struct("<B3xIIQQ")
+NO_WINNER = 255
+INDEX_HEADER = struct.Struct("<I")
+
+GameSummary = namedtuple("GameSummary", ["winner", "turns", "num_moves", "moves_offset", "capture_mask"])
+TurnRecord = namedtuple("TurnRecord", ["color", "dice", "pawn_id"])
+
+
+def encode_turn(color, dice, pawn_id=None):
+    return COLORS.index(color) << 6 | dice << 3 | (0 if pawn_id is None else pawn_id + 1)
+
+
+def decode_turn(byte):
+    pawn_bits = byte & 7
+    return TurnRecord(COLORS[byte >> 6], (byte >> 3) & 7, pawn_bits - 1 if pawn_bits else None)
+
+
+def replay(turns, engine=GameLogic):
+    """Replays TurnRecords and yields the GameSnapshot after each turn."""
+    game = engine()
+    for turn in turns:
+        player = game.get_current_player()
+        game.dice_roll = turn.dice
+        game.movable_pawns = game._get_valid_moves(player, turn.dice)
+        if turn.pawn_id is not None:
+            game.move_pawn(player.pawns[turn.pawn_id])
+            if game.check_win_condition(player):
+                yield game.snapshot
+                return
+        game.advance_turn()
+        yield game.snapshot
+
+
+class GameDatabaseWriter:
+    def __init__(self, path):
+        self.summaries = open(path + ".summaries", "ab")
+        self.moves = open(path + ".moves", "ab")
+        if self.summaries.tell() == 0:
+            self.summaries.write(MAGIC)
+        self._turns = bytearray()
+        self._capture_mask = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.summaries.close()
+        self.moves.close()
+
+    def add_game(self, winner, turns, capture_mask=0):
+        """Appends a game whose per-turn bytes (see encode_turn) are in `turns`."""
+        offset = self.moves.tell()
+        self.moves.write(turns)
+        winner_idx = NO_WINNER if winner is None else COLORS.index(winner)
+        self.summaries.write(SUMMARY.pack(winner_idx, len(turns), sum(1 for b in turns if b & 7), offset, capture_mask))
+
+    def add_events(self, events):
+        """Stores every game of a stats.play_games event stream."""
+        for event in events:
+            kind = event[0]
+            if kind == "roll":
+                self._turns.append(encode_turn(event[1], event[2]))
+            elif kind == "move":
+                self._turns[-1] |= event[2] + 1
+            elif kind == "capture":
+                self._capture_mask |= 1 << event[2]
+            elif kind == "game_end":
+                self.add_game(event[1], self._turns, self._capture_mask)
+                self._turns = bytearray()
+                self._capture_mask = 0
+
+
+def _map(path):
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            # mmap refuses empty files; an archive with no games (or no turns) has one.
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _iter_summaries(buffer):
+    for offset in range(len(MAGIC), len(buffer) - SUMMARY.size + 1, SUMMARY.size):
+        yield GameSummary._make(SUMMARY.unpack_from(buffer, offset))
+
+
+def build_indexes(path):
+    """Writes `path.index` from one sequential pass over the summaries."""
+    summaries = _map(path + ".summaries")
+    by_winner = {color: array("I") for color in COLORS}
+    by_capture_square = [array("I") for _ in range(PATH_LENGTH)]
+    lengths = array("I")
+    for game, summary in enumerate(_iter_summaries(summaries)):
+        if summary.winner != NO_WINNER:
+            by_winner[COLORS[summary.winner]].append(game)
+        mask = summary.capture_mask
+        while mask:
+            low_bit = mask & -mask
+            by_capture_square[low_bit.bit_length() - 1].append(game)
+            mask ^= low_bit
+        lengths.append(summary.turns)
+    summaries.close()
+
+    # Counting sort: turn counts are small, so one counter per length gives every game its slot
+    # directly, without a Python int per game as sorted() would need.
+    counts = [0] * (max(lengths, default=0) + 1)
+    for turns in lengths:
+        counts[turns] += 1
+    slots = []
+    sorted_lengths = array("I")
+    for turns, count in enumerate(counts):
+        slots.append(len(sorted_lengths))
+        sorted_lengths.extend(array("I", [turns]) * count)
+    by_length = array("I", [0]) * len(lengths)
+    for game, turns in enumerate(lengths):
+        by_length[slots[turns]] = game
+        slots[turns] += 1
+
+    sections = [("winner:" + color, games) for color, games in by_winner.items()]
+    sections += [(f"capture:{square}", games) for square, games in enumerate(by_capture_square)]
+    sections += [("length:games", by_length), ("length:turns", sorted_lengths)]
+
+    header = {}
+    offset = 0
+    for name, values in sections:
+        header[name] = [offset, len(values)]
+        offset += len(values) * values.itemsize
+    header_bytes = json.dumps(header).encode()
+    # Sections start on a 4-byte boundary so they can be cast to unsigned ints in place.
+    header_bytes += b" " * (-(INDEX_HEADER.size + len(header_bytes)) % 4)
+
+    with open(path + ".index", "wb") as out:
+        out.write(INDEX_HEADER.pack(len(header_bytes)))
+        out.write(header_bytes)
+        for _, values in sections:
+            values.tofile(out)
+
+
+class GameDatabase:
+    def __init__(self, path):
+        self._summaries = _map(path + ".summaries")
+        if self._summaries[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path}.summaries não é um banco de partidas.")
+        self._moves = _map(path + ".moves")
+        self._index = _map(path + ".index")
+        (header_size,) = INDEX_HEADER.unpack_from(self._index)
+        self._sections = json.loads(bytes(self._index[INDEX_HEADER.size:INDEX_HEADER.size + header_size]))
+        self._data_start = INDEX_HEADER.size + header_size
+
+    def __len__(self):
+        return (len(self._summaries) - len(MAGIC)) // SUMMARY.size
+
+    def close(self):
+        for buffer in (self._summaries, self._moves, self._index):
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+
+    def _section(self, name):
+        offset, count = self._sections[name]
+        start = self._data_start + offset
+        return memoryview(self._index)[start:start + count * 4].cast("I")
+
+    def summary(self, game):
+        return GameSummary._make(SUMMARY.unpack_from(self._summaries, len(MAGIC) + game * SUMMARY.size))
+
+    def turns(self, game):
+        summary = self.summary(game)
+        return [decode_turn(b) for b in self._moves[summary.moves_offset:summary.moves_offset + summary.turns]]
+
+    def games_won_by(self, color):
+        return self._section("winner:" + color).tolist()
+
+    def games_with_capture_on(self, square):
+        return self._section(f"capture:{square}").tolist()
+
+    def games_longer_than(self, turns):
+        lengths = self._section("length:turns")
+        return self._section("length:games")[bisect.bisect_right(lengths, turns):].tolist()
@@ -0,0 +1,472 @@
+"""Tk interface for the Ludo game: the board, the controls and the bot players."""
+
+import tkinter as tk
+from tkinter import messagebox
+import argparse
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import (COLORS, SQUARE_SIZE, BOARD_GRID_SIZE, MAIN_PATH_VISUAL_MAP, START_PATH_INDEX,
+                    HOME_STRETCH_VISUAL_MAP, SAFE_SQUARES_COORDS, TRACK_COORDS, GameLogic)
+
+BOT_TIME_BUDGET = 0.5  # seconds of search per bot move
+BOT_DEADLINE_GRACE = 0.3  # extra wait for the worker process before using the fallback move
+BOT_ROLL_DELAY = 600  # ms before a bot rolls, so humans can follow the game
+
+# Playback speeds: a divisor for animation steps and delays, or None to skip them entirely.
+SPEEDS = {"1×": 1, "4×": 4, "máx": None}
+FRAME_INTERVAL = 16  # ms, about one display frame
+SQUARE_ANIMATION_MS = 200  # time a pawn takes to cross one square at 1×
+SQUARE_ANIMATION_FRAMES = 10  # frames per square at 1×
+RESIZE_DEBOUNCE = 120  # ms without <Configure> events before the board is rescaled
+MIN_SQUARE_SIZE = 16
+STAR_FONT_SIZE = 20  # at SQUARE_SIZE; fonts don't follow canvas.scale, so they are resized separately
+PAWN_FONT_SIZE = 10
+
+
+def track_pixels(square_size):
+    """Centre pixel of every TRACK_COORDS entry for the given square size."""
+    return {
+        color: [(col * square_size + square_size / 2, row * square_size + square_size / 2) for col, row in coords]
+        for color, coords in TRACK_COORDS.items()
+    }
+
+
+class LudoBoardGUI:
+    def __init__(self, master, bot_colors=()):
+        self.master = master
+        self.game = GameLogic()
+        self.game_lock = threading.Lock()
+        self.animation_in_progress = False
+        self.click_index = {}
+        self.undo_stack = []
+        self.bot_colors = set(bot_colors)
+        self.bot_pool = None
+        self.playback_speed = 1
+        self.turbo_thread = None
+        self.turbo_winner = None
+        self.changed_pawns = deque()
+        self.square_size = SQUARE_SIZE
+        self.track_pixels = track_pixels(SQUARE_SIZE)
+        self.animation_waypoints = []
+        self.pending_resize = None
+        self.game.subscribe(self._on_game_event)
+        if self.bot_colors:
+            import bots
+            # One worker process for the whole game: the search runs outside the GIL of the Tk thread.
+            self.bot_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+            self.bot_pool.submit(bots.warm_up)
+
+        master.title("Ludo")
+        master.geometry(f"{BOARD_GRID_SIZE * SQUARE_SIZE}x{BOARD_GRID_SIZE * SQUARE_SIZE + 100}")
+        master.minsize(BOARD_GRID_SIZE * MIN_SQUARE_SIZE, BOARD_GRID_SIZE * MIN_SQUARE_SIZE + 100)
+        self.canvas = tk.Canvas(master, width=BOARD_GRID_SIZE * SQUARE_SIZE, height=BOARD_GRID_SIZE * SQUARE_SIZE, highlightthickness=0)
+        self.info_label = tk.Label(master, text="Bem-vindo ao Ludo! Clique em 'Rolar Dados'.", font=("Arial", 12))
+        control_frame = tk.Frame(master)
+        # The controls are packed first so that shrinking the window takes space from the board only.
+        control_frame.pack(side=tk.BOTTOM, pady=10)
+        self.info_label.pack(side=tk.BOTTOM, pady=5)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.dice_label = tk.Label(control_frame, text="🎲", font=("Arial", 30))
+        self.dice_label.pack(side=tk.LEFT, padx=10)
+        self.roll_button = tk.Button(control_frame, text="Rolar Dados", command=self.handle_roll_dice, font=("Arial", 14))
+        self.roll_button.pack(side=tk.RIGHT, padx=10)
+        self.undo_button = tk.Button(control_frame, text="Desfazer", command=self.handle_undo, font=("Arial", 14))
+        self.undo_button.pack(side=tk.RIGHT, padx=10)
+        self.speed_var = tk.StringVar(value="1×")
+        self.speed_var.trace_add("write", self._on_speed_change)
+        tk.OptionMenu(control_frame, self.speed_var, *SPEEDS).pack(side=tk.LEFT, padx=10)
+        
+        # Drawn once at SQUARE_SIZE; resizing transforms these items instead of drawing them again.
+        self.draw_full_board()
+        self.draw_all_pawns()
+        self.update_turn_indicator()
+        
+        self.canvas.bind("<Button-1>", self.on_canvas_click)
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        
+    def handle_roll_dice(self):
+        if self.animation_in_progress or self.roll_button['state'] == tk.DISABLED: return
+        self.roll_button.config(state=tk.DISABLED)
+        threading.Thread(target=self._threaded_roll_dice, daemon=True).start()
+
+    def _threaded_roll_dice(self):
+        with self.game_lock:
+            self.game.roll_dice()
+            snapshot = self.game.snapshot
+        self.master.after(0, self._update_ui_after_roll, snapshot)
+
+    def on_canvas_click(self, event):
+        if self.roll_button['state'] == tk.NORMAL or self.animation_in_progress:
+            return
+        if self.game.snapshot.current_color in self.bot_colors:
+            return
+
+        cell = (int(event.x // self.square_size), int(event.y // self.square_size))
+        pawns_in_cell = self.click_index.get(cell)
+
+        if pawns_in_cell:
+            self.canvas.delete("highlight")
+            self.click_index = {}
+            threading.Thread(target=self._threaded_move, args=(pawns_in_cell[0],), daemon=True).start()
+        else:
+            self.info_label.config(text="Clique inválido. Escolha um peão destacado.")
+
+    def _rebuild_click_index(self, movable_pawns):
+        # Maps each board cell (col, row) to the movable pawns standing on it, in pawn_id order,
+        # so stacked pawns always resolve to the same one.
+        index = {}
+        for pawn in sorted(movable_pawns, key=lambda p: p.pawn_id):
+            col, row = self.game.get_visual_coords(pawn)
+            index.setdefault((int(col), int(row)), []).append(pawn)
+        self.click_index = index
+
+    def _threaded_move(self, pawn_state):
+        with self.game_lock:
+            if self.animation_in_progress: return
+            self.animation_in_progress = True
+            
+            pawn = self.game.players[pawn_state.color].pawns[pawn_state.pawn_id]
+            span = self.game.get_track_span(pawn, self.game.dice_roll)
+            record = self.game.move_pawn(pawn)
+            self.undo_stack.append(record)
+            
+        speed = self.playback_speed
+        pixel_waypoints = self._pixel_waypoints(pawn_state, span) if speed is not None else []
+        self.animation_waypoints = pixel_waypoints
+        segment_steps, frame_ms = self._animation_pacing()
+        self.master.after(0, self.animate_pawn, pawn_state, pixel_waypoints, record.captured_pawn, 0, segment_steps, 0, frame_ms)
+
+    def _pixel_waypoints(self, pawn_state, span):
+        if span is None:
+            return []
+        first, last = span
+        track = self.track_pixels[pawn_state.color]
+        if first < 0:
+            return [self._to_pixels(*self.game.get_visual_coords(pawn_state))] + track[:last + 1]
+        return track[first:last + 1]
+
+    def handle_undo(self):
+        # Only undo while nothing is pending: at the start of a turn or while waiting for a pawn click.
+        if self.animation_in_progress or not self.undo_stack:
+            return
+        if self.roll_button['state'] == tk.DISABLED and not self.click_index:
+            return
+        # Bot moves are undone together with the human move before them.
+        if not any(record.pawn.color not in self.bot_colors for record in self.undo_stack):
+            return
+
+        with self.game_lock:
+            while True:
+                record = self.undo_stack.pop()
+                self.game.unmake(record)
+                if record.pawn.color not in self.bot_colors:
+                    break
+            snapshot = self.game.snapshot
+
+        self.roll_button.config(state=tk.DISABLED)
+        self.dice_label.config(text=f"🎲 {snapshot.dice_roll}")
+        self.redraw_changed_pawns()
+        self._rebuild_click_index(snapshot.movable_pawns)
+        self.highlight_movable_pawns(snapshot.movable_pawns)
+        self.info_label.config(text=f"Jogada desfeita. {snapshot.current_color.capitalize()}, clique em um peão destacado.")
+
+    def animate_pawn(self, pawn, waypoints, captured_pawn_obj, current_waypoint_idx, segment_steps=SQUARE_ANIMATION_FRAMES, progress_in_segment=0,
+                     frame_ms=SQUARE_ANIMATION_MS // SQUARE_ANIMATION_FRAMES):
+        if not waypoints or current_waypoint_idx >= len(waypoints) - 1:
+            self.redraw_changed_pawns()
+            if captured_pawn_obj:
+                self.info_label.config(text=f"Peão capturado! {pawn.color.capitalize()} joga de novo.")
+            self.end_turn()
+            return
+
+        if progress_in_segment >= segment_steps:
+            progress_in_segment = 0
+            current_waypoint_idx += 1
+            # Re-check to prevent index errors
+            if current_waypoint_idx >= len(waypoints) - 1:
+                self.redraw_changed_pawns()
+                if captured_pawn_obj:
+                    self.info_label.config(text=f"Peão capturado! {pawn.color.capitalize()} joga de novo.")
+                self.end_turn()
+                return
+
+        start_x, start_y = waypoints[current_waypoint_idx]
+        end_x, end_y = waypoints[current_waypoint_idx + 1]
+
+        progress = progress_in_segment / segment_steps
+        self.draw_pawn_at_pixel(pawn, start_x + (end_x - start_x) * progress, start_y + (end_y - start_y) * progress)
+        
+        self.master.after(frame_ms, self.animate_pawn, pawn, waypoints, captured_pawn_obj, current_waypoint_idx, segment_steps,
+                          progress_in_segment + 1, frame_ms)
+
+    def end_turn(self):
+        """Handles the logic at the end of a player's turn."""
+        with self.game_lock:
+            player = self.game.get_current_player()
+
+            if self.game.check_win_condition(player):
+                self.master.after(0, self._show_win_message_and_quit, player)
+                return
+
+            # If a 6 was rolled, the player gets another turn; otherwise it's the next player's turn.
+            rolls_again = self.game.advance_turn()
+            self.animation_in_progress = False
+            if rolls_again:
+                self.master.after(0, self._update_ui_for_reroll, player)
+            else:
+                self.master.after(0, self.update_turn_indicator)
+
+    def _update_ui_after_roll(self, snapshot):
+        self.dice_label.config(text=f"🎲 {snapshot.dice_roll}")
+        self.info_label.config(text=f"{snapshot.current_color.capitalize()} rolou {snapshot.dice_roll}!")
+        
+        if not snapshot.movable_pawns:
+            self.info_label.config(text=f"Nenhum movimento possível para {snapshot.current_color.capitalize()}.")
+            self.master.after(self._scaled_delay(1500), self.end_turn) 
+        elif snapshot.current_color in self.bot_colors:
+            import bots
+            self.highlight_movable_pawns(snapshot.movable_pawns)
+            self.info_label.config(text=f"{snapshot.current_color.capitalize()} está pensando...")
+            future = self.bot_pool.submit(bots.choose_move, snapshot, BOT_TIME_BUDGET)
+            deadline = time.monotonic() + BOT_TIME_BUDGET + BOT_DEADLINE_GRACE
+            self.master.after(20, self._poll_bot_move, future, snapshot, deadline)
+        else:
+            self._rebuild_click_index(snapshot.movable_pawns)
+            self.highlight_movable_pawns(snapshot.movable_pawns)
+            self.info_label.config(text="Clique em um peão destacado para mover.")
+
+    def _poll_bot_move(self, future, snapshot, deadline):
+        if not future.done() and time.monotonic() < deadline:
+            self.master.after(20, self._poll_bot_move, future, snapshot, deadline)
+            return
+
+        pawn_state = None
+        if future.done() and not future.cancelled() and future.exception() is None:
+            pawn_id = future.result()
+            pawn_state = next((p for p in snapshot.movable_pawns if p.pawn_id == pawn_id), None)
+        if pawn_state is None:
+            # Deadline missed or the worker failed: use the cheap greedy pick instead.
+            import bots
+            future.cancel()
+            pawn_id = bots.greedy_choice(bots.game_from_snapshot(snapshot)).pawn_id
+            pawn_state = next(p for p in snapshot.movable_pawns if p.pawn_id == pawn_id)
+
+        self.canvas.delete("highlight")
+        threading.Thread(target=self._threaded_move, args=(pawn_state,), daemon=True).start()
+
+    def _start_bot_turn_if_needed(self):
+        if self.game.snapshot.current_color in self.bot_colors:
+            self.roll_button.config(state=tk.DISABLED)
+            if self.playback_speed is None and self.bot_colors.issuperset(COLORS):
+                self._start_turbo()
+            else:
+                self.master.after(self._scaled_delay(BOT_ROLL_DELAY), self._bot_roll)
+
+    def _bot_roll(self):
+        threading.Thread(target=self._threaded_roll_dice, daemon=True).start()
+
+    def _on_speed_change(self, *_):
+        # Read by worker threads, so kept in a plain attribute rather than the Tk variable.
+        self.playback_speed = SPEEDS[self.speed_var.get()]
+
+    def _on_canvas_configure(self, event):
+        if self.pending_resize is not None:
+            self.master.after_cancel(self.pending_resize)
+        self.pending_resize = self.master.after(RESIZE_DEBOUNCE, self._apply_resize, event.width, event.height)
+
+    def _apply_resize(self, width, height):
+        self.pending_resize = None
+        square_size = max(MIN_SQUARE_SIZE, min(width, height) / BOARD_GRID_SIZE)
+        factor = square_size / self.square_size
+        if abs(factor - 1) < 1e-3:
+            return
+        self.canvas.scale("all", 0, 0, factor, factor)
+        self.square_size = square_size
+        self.track_pixels = track_pixels(square_size)
+        # A running animation keeps reading this list, so it is rescaled in place.
+        self.animation_waypoints[:] = [(x * factor, y * factor) for x, y in self.animation_waypoints]
+        self.canvas.itemconfigure("star", font=("Arial", self._font_size(STAR_FONT_SIZE)))
+        self.canvas.itemconfigure("pawn_label", font=("Arial", self._font_size(PAWN_FONT_SIZE), "bold"))
+
+    def _font_size(self, base_size):
+        return max(1, round(base_size * self.square_size / SQUARE_SIZE))
+
+    def _scaled_delay(self, ms):
+        return 0 if self.playback_speed is None else ms // self.playback_speed
+
+    def _animation_pacing(self):
+        # (frames per square, ms per frame): fewer frames at higher speeds, with the frame interval
+        # stretched to match, so a square takes SQUARE_ANIMATION_MS / speed like every other delay.
+        frames = max(1, round(SQUARE_ANIMATION_FRAMES / (self.playback_speed or 1)))
+        return frames, self._scaled_delay(SQUARE_ANIMATION_MS) // frames
+
+    def _start_turbo(self):
+        # Bots-only game at maximum speed: the engine runs flat out on a worker thread and the
+        # canvas only shows the latest snapshot once per frame, with no per-move animation.
+        self.canvas.delete("highlight")
+        self.info_label.config(text="Avanço rápido...")
+        self.turbo_winner = None
+        self.turbo_thread = threading.Thread(target=self._turbo_worker, daemon=True)
+        self.turbo_thread.start()
+        self.master.after(FRAME_INTERVAL, self._turbo_refresh, None)
+
+    def _turbo_worker(self):
+        import bots
+        while self.playback_speed is None:
+            with self.game_lock:
+                player = self.game.get_current_player()
+                self.game.roll_dice()
+                if self.game.movable_pawns:
+                    # The search makes and unmakes moves in place without publishing, so neither
+                    # the snapshot nor the event listeners ever see a hypothetical move.
+                    self.game.move_pawn(bots.greedy_choice(self.game))
+                    if self.game.check_win_condition(player):
+                        self.turbo_winner = player
+                        return
+                self.game.advance_turn()
+
+    def _turbo_refresh(self, drawn_snapshot):
+        snapshot = self.game.snapshot
+        if snapshot is not drawn_snapshot:
+            self.redraw_changed_pawns()
+            self.dice_label.config(text=f"🎲 {snapshot.dice_roll}")
+
+        if self.turbo_thread.is_alive():
+            self.master.after(FRAME_INTERVAL, self._turbo_refresh, snapshot)
+        elif self.turbo_winner:
+            self.redraw_changed_pawns()
+            self._show_win_message_and_quit(self.turbo_winner)
+        else:
+            # Speed was lowered: carry on turn by turn with animations.
+            self.update_turn_indicator()
+
+    def shutdown(self):
+        if self.bot_pool:
+            self.bot_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _update_ui_for_reroll(self, player):
+        self.info_label.config(text=f"{player.color.capitalize()} tirou 6 e joga de novo! Role os dados.")
+        self.roll_button.config(state=tk.NORMAL)
+        self._start_bot_turn_if_needed()
+
+    def update_turn_indicator(self):
+        player_color = self.game.snapshot.current_color.capitalize()
+        self.info_label.config(text=f"É a vez do jogador {player_color}. Role os dados.")
+        self.roll_button.config(state=tk.NORMAL)
+        self.dice_label.config(text="🎲")
+        self.redraw_changed_pawns()
+        self._start_bot_turn_if_needed()
+
+    def highlight_movable_pawns(self, pawns):
+        self.canvas.delete("highlight")
+        for pawn in pawns:
+            # Get the correct visual coordinates for the highlight.
+            if pawn.position == "home":
+                # Use the coordinates of the pawn's home square, not the pawn piece itself.
+                coords = self.game.initial_pawn_home_coords[pawn.color][pawn.pawn_id]
+                x1, y1 = coords[0] * self.square_size, coords[1] * self.square_size
+            else:
+                col, row = self.game.get_visual_coords(pawn)
+                x1, y1 = col * self.square_size, row * self.square_size
+            
+            self.canvas.create_rectangle(x1, y1, x1 + self.square_size, y1 + self.square_size, outline="gold", width=4, tags="highlight")
+
+    def _show_win_message_and_quit(self, player):
+        messagebox.showinfo("Fim de Jogo", f"O jogador {player.color.capitalize()} venceu!")
+        self.master.quit()
+
+    def draw_full_board(self):
+        self.canvas.create_rectangle(0, 0, BOARD_GRID_SIZE*SQUARE_SIZE, BOARD_GRID_SIZE*SQUARE_SIZE, fill="#DDEEFF", outline="black")
+        self.canvas.create_rectangle(0, 0, 6*SQUARE_SIZE, 6*SQUARE_SIZE, fill="green", width=0)
+        self.canvas.create_rectangle(9*SQUARE_SIZE, 0, 15*SQUARE_SIZE, 6*SQUARE_SIZE, fill="red", width=0)
+        self.canvas.create_rectangle(0, 9*SQUARE_SIZE, 6*SQUARE_SIZE, 15*SQUARE_SIZE, fill="yellow", width=0)
+        self.canvas.create_rectangle(9*SQUARE_SIZE, 9*SQUARE_SIZE, 15*SQUARE_SIZE, 15*SQUARE_SIZE, fill="blue", width=0)
+        for coords_list in self.game.initial_pawn_home_coords.values():
+            for c, r in coords_list:
+                self.draw_square(c, r, "white", "black")
+        for col, row in MAIN_PATH_VISUAL_MAP.values():
+            self.draw_square(col, row, "white", "gray")
+        for color, path_coords in HOME_STRETCH_VISUAL_MAP.items():
+            for col, row in path_coords:
+                self.draw_square(col, row, color, "gray")
+        for color, index in START_PATH_INDEX.items():
+            self.draw_square(*MAIN_PATH_VISUAL_MAP[index], color, "black")
+        for coords in SAFE_SQUARES_COORDS:
+            self._draw_star_symbol(*coords)
+        cx, cy = 7.5*SQUARE_SIZE, 7.5*SQUARE_SIZE
+        self.canvas.create_polygon(6*SQUARE_SIZE, 6*SQUARE_SIZE, 9*SQUARE_SIZE, 6*SQUARE_SIZE, cx, cy, fill="red", outline="black")
+        self.canvas.create_polygon(9*SQUARE_SIZE, 6*SQUARE_SIZE, 9*SQUARE_SIZE, 9*SQUARE_SIZE, cx, cy, fill="blue", outline="black")
+        self.canvas.create_polygon(9*SQUARE_SIZE, 9*SQUARE_SIZE, 6*SQUARE_SIZE, 9*SQUARE_SIZE, cx, cy, fill="yellow", outline="black")
+        self.canvas.create_polygon(6*SQUARE_SIZE, 9*SQUARE_SIZE, 6*SQUARE_SIZE, 6*SQUARE_SIZE, cx, cy, fill="green", outline="black")
+
+    def draw_square(self, col, row, color, outline="lightgray", width=1):
+        x1, y1 = col * SQUARE_SIZE, row * SQUARE_SIZE
+        self.canvas.create_rectangle(x1, y1, x1 + SQUARE_SIZE, y1 + SQUARE_SIZE, fill=color, outline=outline, width=width)
+
+    def _draw_star_symbol(self, col, row):
+        center_x, center_y = col * SQUARE_SIZE + SQUARE_SIZE / 2, row * SQUARE_SIZE + SQUARE_SIZE / 2
+        self.canvas.create_text(center_x, center_y, text="★", font=("Arial", STAR_FONT_SIZE), fill="black", tags="star")
+
+    def draw_all_pawns(self):
+        self.canvas.delete("pawn")
+        for pawn in self.game.snapshot.pawns:
+            col, row = self.game.get_visual_coords(pawn)
+            self.draw_pawn_at(pawn, col, row)
+
+    def _on_game_event(self, kind, **details):
+        # Runs on whichever thread changed the game; the Tk thread drains the queue when it redraws.
+        if kind == "pawn_moved":
+            self.changed_pawns.append(details["pawn"])
+
+    def redraw_changed_pawns(self):
+        # Only the latest state of each pawn that moved since the last redraw is drawn again.
+        changed = {}
+        while self.changed_pawns:
+            pawn = self.changed_pawns.popleft()
+            changed[(pawn.color, pawn.pawn_id)] = pawn
+        for pawn in changed.values():
+            col, row = self.game.get_visual_coords(pawn)
+            self.draw_pawn_at(pawn, col, row)
+
+    def _to_pixels(self, col, row):
+        return col * self.square_size + self.square_size / 2, row * self.square_size + self.square_size / 2
+
+    def draw_pawn_at(self, pawn, col, row):
+        self.draw_pawn_at_pixel(pawn, *self._to_pixels(col, row))
+
+    def draw_pawn_at_pixel(self, pawn, x, y):
+        radius = self.square_size / 2.8
+        pawn_tag = f"pawn_{pawn.color}_{pawn.pawn_id}"
+        items = self.canvas.find_withtag(pawn_tag)
+        if items:
+            # Existing pawns are only moved, so animation frames don't create canvas items.
+            oval, label = items
+            self.canvas.coords(oval, x - radius, y - radius, x + radius, y + radius)
+            self.canvas.coords(label, x, y)
+            self.canvas.tag_raise(pawn_tag)
+            return
+        self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius, 
+                                  fill=pawn.color, outline="black", width=2, 
+                                  tags=("pawn", pawn_tag))
+        self.canvas.create_text(x, y, text=str(pawn.pawn_id + 1), fill="white", 
+                                font=("Arial", self._font_size(PAWN_FONT_SIZE), "bold"), tags=("pawn", "pawn_label", pawn_tag))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ludo")
+    parser.add_argument("--bots", default="", help="cores jogadas pelo computador, ex.: green,yellow,blue")
+    args = parser.parse_args()
+    bot_colors = [color for color in args.bots.split(",") if color]
+    for color in bot_colors:
+        if color not in COLORS:
+            parser.error(f"cor desconhecida: {color}")
+
+    root = tk.Tk()
+    game_gui = LudoBoardGUI(root, bot_colors)
+    root.mainloop()
+    game_gui.shutdown()
+
@@ -0,0 +1,84 @@
+"""Import-time budget for the modules headless tools and worker processes load.
+
+Each module is imported in a fresh interpreter with `-X importtime`, a few
+times, and the fastest cumulative import time is checked against its budget.
+A module also fails if it imports tkinter. The exit status is 1 on any
+failure, so this can gate a CI job:
+
+    python import_budget.py
+    python import_budget.py --repeat 10 engine bots
+"""
+
+import argparse
+import compileall
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Milliseconds of cumulative import time, about twice the slowest of several measurements when they were set, so only
+# real regressions trip them. Most of the larger ones is argparse and concurrent.futures.
+BUDGETS_MS = {
+    "engine": 10,
+    "final": 10,
+    "bitboard": 10,
+    "bots": 10,
+    "rl_env": 16,
+    "stats": 40,
+    "gamedb": 35,
+    "variants": 35,
+    "lockstep": 60,
+    "svg_export": 65,
+    "tournament": 70,
+    "fuzz": 80,
+}
+FORBIDDEN = ("tkinter", "_tkinter")
+
+
+def measure(module):
+    """Returns (cumulative import time in ms, names of forbidden modules it imported)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    cumulative_us = None
+    forbidden = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # the column header
+        if name.strip() in FORBIDDEN:
+            forbidden.add(name.strip())
+        # The module itself is the one line with no indentation after the column separator.
+        if name == f" {module}":
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000, sorted(forbidden)
+
+
+def check(modules, repeat=5):
+    # Bytecode is compiled first so the timings are of a warm cache, as in a real deployment.
+    for module in modules:
+        compileall.compile_file(os.path.join(HERE, module + ".py"), quiet=1)
+    failures = 0
+    for module in modules:
+        runs = [measure(module) for _ in range(repeat)]
+        best = min(ms for ms, _ in runs)
+        forbidden = sorted({name for _, names in runs for name in names})
+        budget = BUDGETS_MS[module]
+        ok = best <= budget and not forbidden
+        failures += not ok
+        note = f"  importa {', '.join(forbidden)}" if forbidden else ""
+        print(f"{'ok   ' if ok else 'FALHA'} {module:12s} {best:7.1f} ms (limite {budget} ms){note}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verifica o tempo de importação dos módulos sem interface gráfica.")
+    parser.add_argument("modules", nargs="*", help=f"padrão: todos ({', '.join(sorted(BUDGETS_MS))})")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for module in args.modules:
+        if module not in BUDGETS_MS:
+            parser.error(f"módulo sem limite definido: {module}")
+    sys.exit(1 if check(args.modules or sorted(BUDGETS_MS), args.repeat) else 0)
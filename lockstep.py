@@ -0,0 +1,235 @@
+"""Lockstep peer-to-peer play.
+
+Both peers run their own GameLogic from the same dice seed. Every turn both
+roll, and both send one turn message: the pawn chosen by the peer whose colour
+is playing (null from the other peer, or when the roll left no choice) and the
+state checksum after the roll. A message that doesn't match the local turn,
+checksum or movable pawns means the peers diverged: the host rewinds to the
+start of the turn and sends its full state, the joining peer adopts it, and
+the turn is played again. Nothing is moved before both messages agree.
+
+Messages are JSON lines over TCP:
+
+    {"type": "hello", "seed": 42, "host_colors": ["red", "yellow"]}
+    {"type": "turn", "turn": 17, "pawn": 2, "checksum": 123456789}
+    {"type": "resync", "turn": 17}
+    {"type": "state", "turn": 17, "state": {...}}
+    {"type": "resynced", "turn": 17}
+
+    python lockstep.py host --port 5555 --colors red,yellow --seed 42
+    python lockstep.py join 192.168.0.10 --port 5555
+    python lockstep.py loopback
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import socket
+
+from engine import COLORS, GameLogic
+
+DEFAULT_PORT = 5555
+RECEIVE_TIMEOUT = 60  # seconds without a message before the other peer is given up on
+MAX_RESYNCS = 3  # state transfers in a row without finishing a turn before giving up
+
+
+class DesyncError(Exception):
+    pass
+
+
+class LockstepPeer:
+    def __init__(self, sock, seed, local_colors, is_host, chooser=None, reader=None):
+        self.sock = sock
+        self.reader = reader or sock.makefile("r", encoding="utf-8", newline="\n")
+        self.game = GameLogic(seed)
+        self.local_colors = set(local_colors)
+        self.is_host = is_host
+        self.chooser = chooser or (lambda game: game.movable_pawns[0])
+        self.turn = 0
+        self.resyncs = 0
+        self._failed_turns = 0
+
+    def send(self, message):
+        self.sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+    def receive(self):
+        """Returns the next message, or None if the line isn't a JSON object."""
+        try:
+            line = self.reader.readline()
+        except socket.timeout:
+            raise ConnectionError(f"O outro jogador não respondeu em {self.sock.gettimeout():g} s.") from None
+        if not line:
+            raise ConnectionError("O outro jogador desconectou.")
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return None
+        return message if isinstance(message, dict) else None
+
+    def _agrees(self, message, checksum, player):
+        if message is None or message.get("type") != "turn" or message.get("turn") != self.turn:
+            return False
+        if message.get("checksum") != checksum:
+            return False
+        if player.color in self.local_colors:
+            return message.get("pawn") is None
+        movable = [pawn.pawn_id for pawn in self.game.movable_pawns]
+        return message.get("pawn") in movable if movable else message.get("pawn") is None
+
+    def _resync(self, start, message):
+        """Puts both peers on the host's state at the start of its current turn.
+
+        Either peer may be the only one to notice the divergence, so each side also
+        treats the other's resync traffic as a mismatch, and drops whatever the other
+        side sent before it adopted the state.
+        """
+        self.resyncs += 1
+        self._failed_turns += 1
+        if self._failed_turns > MAX_RESYNCS:
+            raise DesyncError(f"O turno {self.turn} ainda diverge após {MAX_RESYNCS} transferências de estado.")
+        if self.is_host:
+            self.game.load_state(start)
+            self.send({"type": "state", "turn": self.turn, "state": start})
+            while not (message and message.get("type") == "resynced" and message.get("turn") == self.turn):
+                message = self.receive()
+        else:
+            self.send({"type": "resync", "turn": self.turn})
+            while not (message and message.get("type") == "state"):
+                message = self.receive()
+            self.game.load_state(message["state"])
+            self.turn = message["turn"]
+            self.send({"type": "resynced", "turn": self.turn})
+
+    def play_turn(self):
+        """Plays one turn. Returns the winning color when the game ends, else None."""
+        game = self.game
+        start = game.export_state() if self.is_host else None
+        while True:
+            player = game.get_current_player()
+            game.roll_dice()
+            pawn_id = None
+            if game.movable_pawns and player.color in self.local_colors:
+                pawn_id = self.chooser(game).pawn_id
+            checksum = game.state_checksum()
+            self.send({"type": "turn", "turn": self.turn, "pawn": pawn_id, "checksum": checksum})
+            message = self.receive()
+            if self._agrees(message, checksum, player):
+                break
+            self._resync(start, message)
+        self._failed_turns = 0
+
+        if pawn_id is None:
+            pawn_id = message["pawn"]
+        if pawn_id is not None:
+            game.move_pawn(player.pawns[pawn_id])
+            if game.check_win_condition(player):
+                return player.color
+        game.advance_turn()
+        self.turn += 1
+        return None
+
+    def play(self, max_turns=100000):
+        winner = None
+        while winner is None and self.turn < max_turns:
+            winner = self.play_turn()
+        return winner
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+def host(port, local_colors, seed, chooser=None, ready=None, timeout=RECEIVE_TIMEOUT):
+    with socket.create_server(("", port)) as server:
+        if ready is not None:
+            ready.put(server.getsockname()[1])
+        sock, _ = server.accept()
+    sock.settimeout(timeout)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    peer = LockstepPeer(sock, seed, local_colors, True, chooser)
+    peer.send({"type": "hello", "seed": seed, "host_colors": sorted(local_colors)})
+    return peer
+
+
+def join(address, port, chooser=None, timeout=RECEIVE_TIMEOUT):
+    sock = socket.create_connection((address, port), timeout)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    reader = sock.makefile("r", encoding="utf-8", newline="\n")
+    try:
+        hello = json.loads(reader.readline())
+    except socket.timeout:
+        sock.close()
+        raise ConnectionError(f"O anfitrião não respondeu em {timeout:g} s.") from None
+    local_colors = [color for color in COLORS if color not in hello["host_colors"]]
+    return LockstepPeer(sock, hello["seed"], local_colors, False, chooser, reader)
+
+
+def _random_chooser(seed):
+    rng = random.Random(seed)
+    return lambda game: rng.choice(game.movable_pawns)
+
+
+def _loopback_side(is_host, port_queue, results, seed, desync_at):
+    if is_host:
+        peer = host(0, ["red", "yellow"], seed, _random_chooser(1), port_queue)
+    else:
+        peer = join("127.0.0.1", port_queue.get(), _random_chooser(2))
+    try:
+        while True:
+            if not is_host and peer.turn == desync_at:
+                # Simulates a diverged client: this very turn's exchange has to repair it.
+                pawn = peer.game.players["red"].pawns[0]
+                peer.game._place(pawn, "finished" if pawn.position != "finished" else "home")
+                peer.game._publish()
+            winner = peer.play_turn()
+            if winner is not None or peer.turn >= 100000:
+                break
+        results.put((is_host, winner, peer.turn, peer.game.state_checksum(), peer.resyncs))
+    finally:
+        peer.close()
+
+
+def run_loopback_match(seed=0, desync_at=None):
+    """Plays a full game between two local processes and returns both sides' (winner, turn, checksum, resyncs)."""
+    ctx = multiprocessing.get_context("spawn")
+    port_queue, results = ctx.Queue(), ctx.Queue()
+    sides = [ctx.Process(target=_loopback_side, args=(is_host, port_queue, results, seed, desync_at))
+             for is_host in (True, False)]
+    for process in sides:
+        process.start()
+    outcome = dict((is_host, rest) for is_host, *rest in (results.get(timeout=120) for _ in sides))
+    for process in sides:
+        process.join()
+    return outcome[True], outcome[False]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ludo em rede por lockstep.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    host_parser = sub.add_parser("host")
+    host_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    host_parser.add_argument("--colors", default="red,yellow")
+    host_parser.add_argument("--seed", type=int, default=None)
+    join_parser = sub.add_parser("join")
+    join_parser.add_argument("address")
+    join_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    loopback_parser = sub.add_parser("loopback")
+    loopback_parser.add_argument("--seed", type=int, default=0)
+    loopback_parser.add_argument("--desync-at", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "loopback":
+        host_result, join_result = run_loopback_match(args.seed, args.desync_at)
+        print(f"host: {host_result}\njoin: {join_result}")
+    else:
+        import bots
+        if args.command == "host":
+            seed = args.seed if args.seed is not None else random.getrandbits(32)
+            peer = host(args.port, args.colors.split(","), seed, bots.greedy_choice)
+        else:
+            peer = join(args.address, args.port, bots.greedy_choice)
+        try:
+            print(f"Vencedor: {peer.play()} após {peer.turn} turnos (ressincronizações: {peer.resyncs})")
+        finally:
+            peer.close()
@@ -0,0 +1,187 @@
+"""Gym-style reinforcement-learning environments over the Ludo rules.
+
+The state is kept as flat integer arrays of pawn steps (the same relative track
+numbering as bitboard.py: -1 home, 0-51 main path from the colour's start,
+52-57 home stretch, 58 finished) instead of Pawn/Player objects. The rules
+follow GameLogic: roll, pick one of the movable pawns, capture on non-safe
+squares, roll again on a 6.
+
+All four seats are played by the agent (self-play). Observations are from the
+point of view of the player to act: its four pawns first, then the following
+players in turn order, then the dice value. Turns with no legal move are
+skipped automatically, so every observation is a real decision.
+"""
+
+import random
+from array import array
+
+from engine import COLORS, START_PATH_INDEX
+from bitboard import PATH_LENGTH, FINISH_STEP, HOME_STEP, ENTRY_STEP, SAFE_MASK
+
+NUM_PLAYERS = len(COLORS)
+PAWNS = 4
+STATE_SIZE = NUM_PLAYERS * PAWNS
+OBS_SIZE = STATE_SIZE + 1
+NUM_ACTIONS = PAWNS
+
+# ABSOLUTE_SQUARE[c][step] is the main path square of colour index c at `step`,
+# STEP_OF_SQUARE[c][square] the inverse, SAFE_STEP[c][step] whether that square is safe.
+ABSOLUTE_SQUARE = [[(START_PATH_INDEX[color] + step) % PATH_LENGTH for step in range(PATH_LENGTH)] for color in COLORS]
+STEP_OF_SQUARE = [[(square - START_PATH_INDEX[color]) % PATH_LENGTH for square in range(PATH_LENGTH)] for color in COLORS]
+SAFE_STEP = [[bool(SAFE_MASK >> square & 1) for square in squares] for squares in ABSOLUTE_SQUARE]
+# Indexed by step + 1, so home (-1) is row 0. TARGET_STEP[dice][row] is where a pawn moves with `dice`,
+# or None if it cannot; BLOCKING_BIT[c][row] is 1 << step when a pawn of colour index c there keeps
+# its own colour off that (non-safe main path) square, otherwise 0.
+TARGET_STEP = [None] + [
+    [ENTRY_STEP if dice == 6 else None]
+    + [step + dice if step + dice <= FINISH_STEP else None for step in range(FINISH_STEP)]
+    + [None]
+    for dice in range(1, 7)
+]
+BLOCKING_BIT = [[0] + [1 << step if not safe[step] else 0 for step in range(PATH_LENGTH)] + [0] * (FINISH_STEP - PATH_LENGTH + 1)
+                for safe in SAFE_STEP]
+# MASK_ROWS[mask] is the action mask row of a legal-pawn bitmask.
+MASK_ROWS = [array("B", [mask >> pawn & 1 for pawn in range(PAWNS)]) for mask in range(1 << PAWNS)]
+OTHER_PLAYERS = [[other for other in range(NUM_PLAYERS) if other != player] for player in range(NUM_PLAYERS)]
+
+
+class VectorLudoEnv:
+    """Steps `num_envs` independent games per call and resets finished ones automatically."""
+
+    def __init__(self, num_envs, seed=None):
+        self.num_envs = num_envs
+        self.rng = random.Random(seed)
+        self.steps = array("b", [HOME_STEP] * (STATE_SIZE * num_envs))
+        self.current_player = array("b", [0] * num_envs)
+        self.dice = array("b", [0] * num_envs)
+        self.action_masks = array("B", [0] * (NUM_ACTIONS * num_envs))
+        self.observations = array("b", [0] * (OBS_SIZE * num_envs))
+        self.rewards = array("f", [0.0] * num_envs)
+        self.dones = array("B", [0] * num_envs)
+
+    def reset(self):
+        for env in range(self.num_envs):
+            self._reset_env(env)
+        return self.observations, self.action_masks
+
+    def step(self, actions):
+        """Applies one action per environment.
+
+        Returns (observations, rewards, dones, action_masks). A reward of 1 goes to the
+        player whose move won; that environment is reset and its observation is the
+        first decision of the new game.
+        """
+        steps = self.steps
+        for env in range(self.num_envs):
+            action = actions[env]
+            if not (0 <= action < NUM_ACTIONS and self.action_masks[env * NUM_ACTIONS + action]):
+                raise ValueError(f"Ação inválida {action} no ambiente {env}.")
+
+            player = self.current_player[env]
+            dice = self.dice[env]
+            base = env * STATE_SIZE
+            self._move(base, player, action, dice)
+
+            own = base + player * PAWNS
+            if steps[own] == steps[own + 1] == steps[own + 2] == steps[own + 3] == FINISH_STEP:
+                self.rewards[env] = 1.0
+                self.dones[env] = 1
+                self._reset_env(env)
+                continue
+
+            self.rewards[env] = 0.0
+            self.dones[env] = 0
+            if dice != 6:
+                self.current_player[env] = (player + 1) % NUM_PLAYERS
+            self._roll_until_decision(env)
+        return self.observations, self.rewards, self.dones, self.action_masks
+
+    def _reset_env(self, env):
+        base = env * STATE_SIZE
+        self.steps[base:base + STATE_SIZE] = array("b", [HOME_STEP] * STATE_SIZE)
+        self.current_player[env] = 0
+        self._roll_until_decision(env)
+
+    def _roll_until_decision(self, env):
+        base = env * STATE_SIZE
+        player = self.current_player[env]
+        random = self.rng.random
+        while True:
+            dice = int(random() * 6) + 1
+            mask = self._legal_mask(base, player, dice)
+            if mask:
+                break
+            if dice != 6:
+                player = (player + 1) % NUM_PLAYERS
+        self.current_player[env] = player
+        self.dice[env] = dice
+
+        self.action_masks[env * NUM_ACTIONS:(env + 1) * NUM_ACTIONS] = MASK_ROWS[mask]
+
+        # The player to act and the ones after it in turn order are one rotation of the state.
+        steps = self.steps
+        own = base + player * PAWNS
+        out = env * OBS_SIZE
+        self.observations[out:out + STATE_SIZE] = steps[own:base + STATE_SIZE] + steps[base:own]
+        self.observations[out + STATE_SIZE] = dice
+
+    def _legal_mask(self, base, player, dice):
+        # Reads the pawns straight out of self.steps: slicing them into a new array for every roll
+        # cost more than the rest of the check.
+        steps = self.steps
+        own = base + player * PAWNS
+        targets = TARGET_STEP[dice]
+        blocking = BLOCKING_BIT[player]
+        # Same-colour pawns block non-safe main path squares.
+        occupied = (blocking[steps[own] + 1] | blocking[steps[own + 1] + 1]
+                    | blocking[steps[own + 2] + 1] | blocking[steps[own + 3] + 1])
+        mask = 0
+        for pawn in range(PAWNS):
+            target = targets[steps[own + pawn] + 1]
+            if target is not None and not occupied >> target & 1:
+                mask |= 1 << pawn
+        return mask
+
+    def _move(self, base, player, pawn, dice):
+        steps = self.steps
+        idx = base + player * PAWNS + pawn
+        step = steps[idx]
+        target = ENTRY_STEP if step == HOME_STEP else step + dice
+        steps[idx] = target
+        if target >= PATH_LENGTH or SAFE_STEP[player][target]:
+            return
+        square = ABSOLUTE_SQUARE[player][target]
+        for other in OTHER_PLAYERS[player]:
+            other_step = STEP_OF_SQUARE[other][square]
+            other_base = base + other * PAWNS
+            for other_idx in range(other_base, other_base + PAWNS):
+                if steps[other_idx] == other_step:
+                    steps[other_idx] = HOME_STEP
+                    return
+
+
+class LudoEnv:
+    """Single-game view over VectorLudoEnv with the classic gym reset/step signatures.
+
+    As in the vector version, a finished game restarts right away: the observation
+    returned with done=True is already the first decision of the next game.
+    """
+
+    def __init__(self, seed=None):
+        self._envs = VectorLudoEnv(1, seed)
+        self._action = [0]
+
+    @property
+    def current_color(self):
+        return COLORS[self._envs.current_player[0]]
+
+    def reset(self):
+        observations, masks = self._envs.reset()
+        return observations.tolist(), {"action_mask": masks.tolist(), "player": self.current_color}
+
+    def step(self, action):
+        player = self.current_color
+        self._action[0] = action
+        observations, rewards, dones, masks = self._envs.step(self._action)
+        info = {"action_mask": masks.tolist(), "player": self.current_color, "mover": player}
+        return observations.tolist(), rewards[0], bool(dones[0]), info
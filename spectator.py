@@ -0,0 +1,166 @@
+"""Spectator wall: a grid of live games in one Tk window.
+
+Every tile is fed by an iterator of GameSnapshots: headless games played by
+bots (`bot_games`) or archived games from a game database (`replay_games`).
+The static board is rasterized once by svg_export into a single PhotoImage
+that every tile shows; a tile only owns its 16 pawn ovals, which are moved
+with `canvas.coords` when their position changes. One frame-paced loop
+advances the feeds and redraws, instead of an `after` chain per game.
+
+    python spectator.py --boards 36 --columns 6 --square-size 12
+    python spectator.py --db games --games 0 1 2 3
+"""
+
+import argparse
+import base64
+import itertools
+import math
+import random
+import time
+import tkinter as tk
+
+from engine import BOARD_GRID_SIZE, GameLogic
+from gui import FRAME_INTERVAL
+from svg_export import raster_template
+import bots
+
+TILE_GAP = 6
+TURN_INTERVAL = 0.25  # seconds between turns of one board
+HOLD_TURNS = 8  # turns a finished game stays on screen before the next one starts
+MAX_GAME_TURNS = 5000
+
+
+def bot_games(seed, chooser=bots.greedy_choice, hold_turns=HOLD_TURNS):
+    """Endless stream of snapshots, one per turn, of bot games played one after the other."""
+    rng = random.Random(seed)
+    while True:
+        game = GameLogic(rng.getrandbits(32))
+        yield game.snapshot
+        for _ in range(MAX_GAME_TURNS):
+            player = game.get_current_player()
+            game.roll_dice()
+            if game.movable_pawns:
+                game.move_pawn(chooser(game))
+                if game.check_win_condition(player):
+                    break
+            game.advance_turn()
+            yield game.snapshot
+        for _ in range(hold_turns):
+            yield game.snapshot
+
+
+def replay_games(db_path, games, hold_turns=HOLD_TURNS):
+    """Endless stream of snapshots replaying archived games in a loop."""
+    from gamedb import GameDatabase, replay
+
+    db = GameDatabase(db_path)
+    for game in itertools.cycle(games):
+        snapshot = None
+        for snapshot in replay(db.turns(game)):
+            yield snapshot
+        for _ in range(hold_turns):
+            yield snapshot
+
+
+class SpectatorWall:
+    def __init__(self, master, feeds, columns=None, square_size=12, turn_interval=TURN_INTERVAL):
+        self.master = master
+        self.feeds = list(feeds)
+        self.square_size = square_size
+        self.turn_interval = turn_interval
+        self.columns = columns or math.ceil(math.sqrt(len(self.feeds)))
+        rows = math.ceil(len(self.feeds) / self.columns)
+        board_size = BOARD_GRID_SIZE * square_size
+        self.tile_size = board_size + TILE_GAP
+
+        master.title(f"Ludo - {len(self.feeds)} partidas")
+        self.canvas = tk.Canvas(master, width=self.columns * self.tile_size, height=rows * self.tile_size,
+                                background="black", highlightthickness=0)
+        self.canvas.pack()
+        # One image shared by every tile; Tk keeps a single copy of its pixels.
+        self.board_image = tk.PhotoImage(data=base64.b64encode(raster_template(square_size).to_png()), format="png")
+        self._coords_game = GameLogic()
+        self._pixel_cache = {}
+
+        self.tiles = []
+        now = time.monotonic()
+        for idx, feed in enumerate(self.feeds):
+            x0 = (idx % self.columns) * self.tile_size + TILE_GAP / 2
+            y0 = (idx // self.columns) * self.tile_size + TILE_GAP / 2
+            self.canvas.create_image(x0, y0, image=self.board_image, anchor=tk.NW)
+            tile = {
+                "origin": (x0, y0),
+                "feed": feed,
+                "pawns": {},
+                "drawn": {},
+                # Tiles are staggered so their turns are spread over the frames instead of landing together.
+                "next_turn": now + turn_interval * idx / len(self.feeds),
+            }
+            self._show(tile, next(feed))
+            self.tiles.append(tile)
+
+        self.frames = 0
+        self.fps_started = now
+        self.master.after(FRAME_INTERVAL, self._frame)
+
+    def _pixels(self, pawn):
+        # Board pixel centre of a pawn state; the same few hundred states repeat across all tiles.
+        key = (pawn.color, pawn.pawn_id, pawn.position)
+        pixels = self._pixel_cache.get(key)
+        if pixels is None:
+            col, row = self._coords_game.get_visual_coords(pawn)
+            pixels = self._pixel_cache[key] = ((col + 0.5) * self.square_size, (row + 0.5) * self.square_size)
+        return pixels
+
+    def _show(self, tile, snapshot):
+        x0, y0 = tile["origin"]
+        radius = self.square_size / 2.8
+        for pawn in snapshot.pawns:
+            key = (pawn.color, pawn.pawn_id)
+            if tile["drawn"].get(key) == pawn.position:
+                continue
+            tile["drawn"][key] = pawn.position
+            x, y = self._pixels(pawn)
+            box = (x0 + x - radius, y0 + y - radius, x0 + x + radius, y0 + y + radius)
+            item = tile["pawns"].get(key)
+            if item is None:
+                tile["pawns"][key] = self.canvas.create_oval(*box, fill=pawn.color, outline="black")
+            else:
+                self.canvas.coords(item, *box)
+                self.canvas.tag_raise(item)
+
+    def _frame(self):
+        started = time.monotonic()
+        for tile in self.tiles:
+            if started >= tile["next_turn"]:
+                # A board that fell behind skips ahead rather than replaying every missed turn.
+                tile["next_turn"] = max(tile["next_turn"] + self.turn_interval, started)
+                self._show(tile, next(tile["feed"]))
+
+        self.frames += 1
+        if started - self.fps_started >= 1:
+            self.master.title(f"Ludo - {len(self.tiles)} partidas - {self.frames / (started - self.fps_started):.0f} fps")
+            self.frames, self.fps_started = 0, started
+        elapsed_ms = (time.monotonic() - started) * 1000
+        self.master.after(max(1, int(FRAME_INTERVAL - elapsed_ms)), self._frame)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mural de partidas de Ludo ao vivo.")
+    parser.add_argument("--boards", type=int, default=36)
+    parser.add_argument("--columns", type=int, default=None)
+    parser.add_argument("--square-size", type=int, default=12)
+    parser.add_argument("--turn-interval", type=float, default=TURN_INTERVAL, help="segundos entre turnos de cada tabuleiro")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", help="banco de partidas a reproduzir em vez de jogos de bots")
+    parser.add_argument("--games", type=int, nargs="*", default=None, help="partidas do banco a reproduzir")
+    args = parser.parse_args()
+
+    if args.db:
+        games = args.games or list(range(args.boards))
+        feeds = [replay_games(args.db, games[idx::args.boards] or games) for idx in range(min(args.boards, len(games)))]
+    else:
+        feeds = [bot_games(args.seed * 100003 + idx) for idx in range(args.boards)]
+    root = tk.Tk()
+    SpectatorWall(root, feeds, args.columns, args.square_size, args.turn_interval)
+    root.mainloop()
@@ -0,0 +1,193 @@
+"""Streaming statistics over headless games.
+
+`play_games` yields one small event tuple at a time and `StatsAggregator` folds
+them into fixed-size counters, so memory does not grow with the number of games.
+Run `python stats.py 1000000 --out stats.jsonl` for a batch job; a cumulative
+summary line (or CSV row) is appended every `--flush-every` games. CSV output
+keeps the scalar figures in the named file and writes each per-bin aggregate
+(game length histogram, capture rate by square, six-roll chains) to a companion
+file next to it, e.g. stats.length_histogram.csv, as one (games, bin, value)
+row per bin at every flush.
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+from contextlib import ExitStack
+
+from engine import COLORS, GameLogic
+
+PATH_LENGTH = 52
+
+# Event tuples, first field is the kind:
+#   ("game_start", game_idx)
+#   ("roll", color, value)
+#   ("move", color, pawn_id)
+#   ("capture", color, square, captured_color)
+#   ("game_end", winner_color_or_None, turns)
+
+
+def play_games(num_games, seed=0, engine=GameLogic, max_turns=10000):
+    """Plays `num_games` games with a random pawn choice and yields their events."""
+    rng = random.Random(seed)
+    for game_idx in range(num_games):
+        game = engine(seed=rng.getrandbits(32))
+        yield ("game_start", game_idx)
+
+        winner = None
+        turns = 0
+        while turns < max_turns:
+            turns += 1
+            player = game.get_current_player()
+            dice_value, movable_pawns = game.roll_dice(publish=False)
+            yield ("roll", player.color, dice_value)
+
+            if movable_pawns:
+                record = game.move_pawn(rng.choice(movable_pawns), publish=False)
+                yield ("move", player.color, record.pawn.pawn_id)
+                if record.captured_pawn:
+                    yield ("capture", player.color, record.pawn.position[1], record.captured_pawn.color)
+                if game.check_win_condition(player):
+                    winner = player.color
+                    break
+            game.advance_turn(publish=False)
+
+        yield ("game_end", winner, turns)
+
+
+class StatsAggregator:
+    def __init__(self, max_game_length=2000, max_six_chain=10):
+        self.games = 0
+        self.unfinished_games = 0
+        self.total_turns = 0
+        self.total_captures = 0
+        # The last bin of each histogram collects everything above the maximum.
+        self.length_histogram = [0] * (max_game_length + 1)
+        self.six_chain_histogram = [0] * (max_six_chain + 1)
+        self.captures_per_square = [0] * PATH_LENGTH
+        self.wins_by_seat = [0] * len(COLORS)
+        self._length_mean = 0.0
+        self._length_m2 = 0.0
+        self._chain_color = None
+        self._chain_length = 0
+
+    def consume(self, events):
+        for event in events:
+            self.add(event)
+        return self
+
+    def add(self, event):
+        kind = event[0]
+        if kind == "roll":
+            _, color, value = event
+            if value == 6 and color == self._chain_color:
+                self._chain_length += 1
+            else:
+                self._close_six_chain()
+                if value == 6:
+                    self._chain_color = color
+                    self._chain_length = 1
+        elif kind == "capture":
+            self.total_captures += 1
+            self.captures_per_square[event[2]] += 1
+        elif kind == "game_end":
+            _, winner, turns = event
+            self._close_six_chain()
+            self.games += 1
+            self.total_turns += turns
+            self.length_histogram[min(turns, len(self.length_histogram) - 1)] += 1
+            # Welford's online mean/variance.
+            delta = turns - self._length_mean
+            self._length_mean += delta / self.games
+            self._length_m2 += delta * (turns - self._length_mean)
+            if winner is None:
+                self.unfinished_games += 1
+            else:
+                self.wins_by_seat[COLORS.index(winner)] += 1
+
+    def _close_six_chain(self):
+        if self._chain_length:
+            self.six_chain_histogram[min(self._chain_length, len(self.six_chain_histogram) - 1)] += 1
+        self._chain_color = None
+        self._chain_length = 0
+
+    def summary(self):
+        games = self.games or 1
+        finished = (self.games - self.unfinished_games) or 1
+        return {
+            "games": self.games,
+            "unfinished_games": self.unfinished_games,
+            "mean_length": self._length_mean,
+            "length_variance": self._length_m2 / games,
+            "captures_per_game": self.total_captures / games,
+            "first_player_win_rate": self.wins_by_seat[0] / finished,
+            "win_rate_by_seat": {color: wins / finished for color, wins in zip(COLORS, self.wins_by_seat)},
+            "capture_rate_by_square": [count / games for count in self.captures_per_square],
+            "length_histogram": {turns: count for turns, count in enumerate(self.length_histogram) if count},
+            "six_chain_histogram": {length: count for length, count in enumerate(self.six_chain_histogram) if count},
+        }
+
+
+CSV_FIELDS = ["games", "unfinished_games", "mean_length", "length_variance", "captures_per_game", "first_player_win_rate"]
+CSV_FIELDS += [f"win_rate_{color}" for color in COLORS]
+# Summary key -> name of its bin column in the companion file.
+CSV_SERIES = {"length_histogram": "turns", "capture_rate_by_square": "square", "six_chain_histogram": "sixes"}
+
+
+def companion_path(out_path, series):
+    root, ext = os.path.splitext(out_path)
+    return f"{root}.{series}{ext}"
+
+
+def _csv_writer(out, fieldnames):
+    writer = csv.DictWriter(out, fieldnames=fieldnames, extrasaction="ignore")
+    if out.tell() == 0:
+        writer.writeheader()
+    return writer
+
+
+def run(num_games, out_path, seed=0, flush_every=10000):
+    """Aggregates `num_games` games, appending a cumulative summary to `out_path` every `flush_every` games."""
+    as_csv = out_path.endswith(".csv")
+    stats = StatsAggregator()
+    with ExitStack() as files:
+        out = files.enter_context(open(out_path, "a", newline=""))
+        writer = _csv_writer(out, CSV_FIELDS) if as_csv else None
+        series_files = {}
+        if as_csv:
+            for series, column in CSV_SERIES.items():
+                series_out = files.enter_context(open(companion_path(out_path, series), "a", newline=""))
+                series_files[series] = (series_out, _csv_writer(series_out, ["games", column, "value"]), column)
+
+        def flush():
+            summary = stats.summary()
+            if writer:
+                writer.writerow(dict(summary, **{f"win_rate_{color}": rate for color, rate in summary["win_rate_by_seat"].items()}))
+                for series, (series_out, series_writer, column) in series_files.items():
+                    values = summary[series]
+                    bins = values.items() if isinstance(values, dict) else enumerate(values)
+                    series_writer.writerows({"games": stats.games, column: key, "value": value} for key, value in bins)
+                    series_out.flush()
+            else:
+                out.write(json.dumps(summary) + "\n")
+            out.flush()
+
+        for event in play_games(num_games, seed):
+            stats.add(event)
+            if event[0] == "game_end" and stats.games % flush_every == 0:
+                flush()
+        if stats.games % flush_every:
+            flush()
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs headless Ludo games and streams aggregate statistics.")
+    parser.add_argument("games", type=int)
+    parser.add_argument("--out", default="stats.jsonl", help="output file, .csv or .jsonl")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--flush-every", type=int, default=10000)
+    args = parser.parse_args()
+    run(args.games, args.out, args.seed, args.flush_every)
@@ -0,0 +1,268 @@
+"""Headless board renderer: SVG frames, and PNG through a small stdlib rasterizer.
+
+The drawing mirrors LudoBoardGUI.draw_full_board and draw_pawn_at, but builds a
+list of shape primitives instead of canvas items. The static board is rendered
+once per square size and reused as a template; only the pawns are drawn per
+frame. Frames come out of generators, and `export_games` spreads whole games
+over a process pool:
+
+    python svg_export.py games 0 17 42 --out frames --format png
+"""
+
+import argparse
+import math
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import (BOARD_GRID_SIZE, HOME_STRETCH_VISUAL_MAP, MAIN_PATH_VISUAL_MAP, SAFE_SQUARES_COORDS,
+                   SQUARE_SIZE, START_PATH_INDEX, GameLogic)
+
+# Tk resolves colour names with the X11 table, which differs from SVG for green and gray.
+TK_COLORS = {
+    "red": "#FF0000", "green": "#00FF00", "yellow": "#FFFF00", "blue": "#0000FF",
+    "white": "#FFFFFF", "black": "#000000", "gray": "#BEBEBE", "lightgray": "#D3D3D3",
+    "gold": "#FFD700", "#DDEEFF": "#DDEEFF",
+}
+
+
+def _rgb(color):
+    value = TK_COLORS[color]
+    return bytes((int(value[1:3], 16), int(value[3:5], 16), int(value[5:7], 16)))
+
+
+def board_shapes(square_size=SQUARE_SIZE):
+    """Shape primitives for the static board, in draw_full_board order."""
+    s = square_size
+    shapes = [
+        ("rect", 0, 0, BOARD_GRID_SIZE * s, BOARD_GRID_SIZE * s, "#DDEEFF", "black", 1),
+        ("rect", 0, 0, 6 * s, 6 * s, "green", None, 0),
+        ("rect", 9 * s, 0, 15 * s, 6 * s, "red", None, 0),
+        ("rect", 0, 9 * s, 6 * s, 15 * s, "yellow", None, 0),
+        ("rect", 9 * s, 9 * s, 15 * s, 15 * s, "blue", None, 0),
+    ]
+
+    def square(col, row, fill, outline):
+        shapes.append(("rect", col * s, row * s, (col + 1) * s, (row + 1) * s, fill, outline, 1))
+
+    for coords_list in GameLogic().initial_pawn_home_coords.values():
+        for col, row in coords_list:
+            square(col, row, "white", "black")
+    for col, row in MAIN_PATH_VISUAL_MAP.values():
+        square(col, row, "white", "gray")
+    for color, path_coords in HOME_STRETCH_VISUAL_MAP.items():
+        for col, row in path_coords:
+            square(col, row, color, "gray")
+    for color, index in START_PATH_INDEX.items():
+        square(*MAIN_PATH_VISUAL_MAP[index], color, "black")
+    for col, row in SAFE_SQUARES_COORDS:
+        shapes.append(("star", col * s + s / 2, row * s + s / 2, s * 0.3, "black"))
+    cx, cy = 7.5 * s, 7.5 * s
+    for points, color in (((6, 6, 9, 6), "red"), ((9, 6, 9, 9), "blue"), ((9, 9, 6, 9), "yellow"), ((6, 9, 6, 6), "green")):
+        x1, y1, x2, y2 = (value * s for value in points)
+        shapes.append(("polygon", ((x1, y1), (x2, y2), (cx, cy)), color, "black"))
+    return shapes
+
+
+# Only used for its coordinate helpers, which don't depend on game state.
+_COORDS_GAME = GameLogic()
+
+
+def pawn_shapes(snapshot, square_size=SQUARE_SIZE):
+    """Shape primitives for every pawn of a GameSnapshot, as draw_pawn_at places them."""
+    game = _COORDS_GAME
+    s = square_size
+    radius = s / 2.8
+    shapes = []
+    for pawn in snapshot.pawns:
+        col, row = game.get_visual_coords(pawn)
+        x, y = col * s + s / 2, row * s + s / 2
+        shapes.append(("circle", x, y, radius, pawn.color, "black", 2))
+        shapes.append(("text", x, y, str(pawn.pawn_id + 1), "white"))
+    return shapes
+
+
+def _star_points(cx, cy, radius):
+    points = []
+    for i in range(10):
+        r = radius if i % 2 == 0 else radius * 0.4
+        angle = -math.pi / 2 + i * math.pi / 5
+        points.append((cx + r * math.cos(angle), cy + r * math.sin(angle)))
+    return points
+
+
+# --- SVG ---
+
+def _svg_shape(shape):
+    kind = shape[0]
+    if kind == "rect":
+        _, x1, y1, x2, y2, fill, outline, width = shape
+        stroke = f' stroke="{TK_COLORS[outline]}" stroke-width="{width}"' if outline and width else ""
+        return f'<rect x="{x1}" y="{y1}" width="{x2 - x1}" height="{y2 - y1}" fill="{TK_COLORS[fill]}"{stroke}/>'
+    if kind == "polygon":
+        _, points, fill, outline = shape
+        coords = " ".join(f"{x:g},{y:g}" for x, y in points)
+        return f'<polygon points="{coords}" fill="{TK_COLORS[fill]}" stroke="{TK_COLORS[outline]}"/>'
+    if kind == "star":
+        _, x, y, radius, fill = shape
+        return (f'<text x="{x:g}" y="{y:g}" font-family="Arial" font-size="{radius * 2:g}" fill="{TK_COLORS[fill]}" '
+                f'text-anchor="middle" dominant-baseline="central">★</text>')
+    if kind == "circle":
+        _, x, y, radius, fill, outline, width = shape
+        return (f'<circle cx="{x:g}" cy="{y:g}" r="{radius:g}" fill="{TK_COLORS[fill]}" '
+                f'stroke="{TK_COLORS[outline]}" stroke-width="{width}"/>')
+    _, x, y, text, fill = shape
+    return (f'<text x="{x:g}" y="{y:g}" font-family="Arial" font-size="10pt" font-weight="bold" fill="{TK_COLORS[fill]}" '
+            f'text-anchor="middle" dominant-baseline="central">{text}</text>')
+
+
+def svg_template(square_size=SQUARE_SIZE):
+    size = BOARD_GRID_SIZE * square_size
+    header = f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}">'
+    return "\n".join([header] + [_svg_shape(shape) for shape in board_shapes(square_size)])
+
+
+def render_svg_frames(snapshots, square_size=SQUARE_SIZE):
+    template = svg_template(square_size)
+    for snapshot in snapshots:
+        pawns = "\n".join(_svg_shape(shape) for shape in pawn_shapes(snapshot, square_size))
+        yield f"{template}\n{pawns}\n</svg>\n"
+
+
+# --- PNG ---
+
+class Raster:
+    """RGB framebuffer with just the fills the board needs.
+
+    Polygon outlines and text other than the star (the pawn numbers) are not drawn.
+    """
+
+    def __init__(self, width, height, pixels=None):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(pixels) if pixels is not None else bytearray(width * height * 3)
+
+    def copy(self):
+        return Raster(self.width, self.height, self.pixels)
+
+    def fill_rect(self, x1, y1, x2, y2, color):
+        x1, x2 = max(0, int(x1)), min(self.width, int(x2))
+        if x2 <= x1:
+            return
+        row_bytes = _rgb(color) * (x2 - x1)
+        for y in range(max(0, int(y1)), min(self.height, int(y2))):
+            start = (y * self.width + x1) * 3
+            self.pixels[start:start + len(row_bytes)] = row_bytes
+
+    def outline_rect(self, x1, y1, x2, y2, color, width):
+        self.fill_rect(x1, y1, x2, y1 + width, color)
+        self.fill_rect(x1, y2 - width, x2, y2, color)
+        self.fill_rect(x1, y1, x1 + width, y2, color)
+        self.fill_rect(x2 - width, y1, x2, y2, color)
+
+    def fill_polygon(self, points, color):
+        # Even-odd scanline fill sampled at pixel centres.
+        ys = [y for _, y in points]
+        for y in range(max(0, int(min(ys))), min(self.height, int(math.ceil(max(ys))))):
+            yc = y + 0.5
+            crossings = []
+            for (xa, ya), (xb, yb) in zip(points, points[1:] + points[:1]):
+                if (ya <= yc < yb) or (yb <= yc < ya):
+                    crossings.append(xa + (yc - ya) * (xb - xa) / (yb - ya))
+            crossings.sort()
+            for left, right in zip(crossings[::2], crossings[1::2]):
+                self.fill_rect(math.ceil(left - 0.5), y, math.floor(right - 0.5) + 1, y + 1, color)
+
+    def fill_circle(self, cx, cy, radius, color):
+        for y in range(max(0, int(cy - radius)), min(self.height, int(math.ceil(cy + radius)))):
+            dy = y + 0.5 - cy
+            if abs(dy) > radius:
+                continue
+            dx = math.sqrt(radius * radius - dy * dy)
+            self.fill_rect(math.ceil(cx - dx - 0.5), y, math.floor(cx + dx - 0.5) + 1, y + 1, color)
+
+    def draw(self, shape):
+        kind = shape[0]
+        if kind == "rect":
+            _, x1, y1, x2, y2, fill, outline, width = shape
+            self.fill_rect(x1, y1, x2, y2, fill)
+            if outline and width:
+                self.outline_rect(x1, y1, x2, y2, outline, width)
+        elif kind == "polygon":
+            _, points, fill, outline = shape
+            self.fill_polygon(list(points), fill)
+        elif kind == "star":
+            _, x, y, radius, fill = shape
+            self.fill_polygon(_star_points(x, y, radius), fill)
+        elif kind == "circle":
+            _, x, y, radius, fill, outline, width = shape
+            self.fill_circle(x, y, radius + width / 2, outline)
+            self.fill_circle(x, y, radius - width / 2, fill)
+
+    def to_png(self):
+        row_size = self.width * 3
+        raw = b"".join(b"\0" + bytes(self.pixels[y * row_size:(y + 1) * row_size]) for y in range(self.height))
+
+        def chunk(kind, data):
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b"")
+
+
+def raster_template(square_size=SQUARE_SIZE):
+    size = BOARD_GRID_SIZE * square_size
+    raster = Raster(size, size)
+    for shape in board_shapes(square_size):
+        raster.draw(shape)
+    return raster
+
+
+def render_png_frames(snapshots, square_size=SQUARE_SIZE):
+    template = raster_template(square_size)
+    for snapshot in snapshots:
+        frame = template.copy()
+        for shape in pawn_shapes(snapshot, square_size):
+            frame.draw(shape)
+        yield frame.to_png()
+
+
+# --- Batch export ---
+
+def export_game(db_path, game, out_dir, fmt="svg", square_size=SQUARE_SIZE):
+    """Writes one file per turn of an archived game. Returns the number of frames."""
+    from gamedb import GameDatabase, replay
+
+    db = GameDatabase(db_path)
+    try:
+        snapshots = replay(db.turns(game))
+        frames = render_png_frames(snapshots, square_size) if fmt == "png" else render_svg_frames(snapshots, square_size)
+        count = 0
+        for count, frame in enumerate(frames, 1):
+            path = os.path.join(out_dir, f"game{game:08d}_{count:05d}.{fmt}")
+            with open(path, "wb") as out:
+                out.write(frame if fmt == "png" else frame.encode("utf-8"))
+        return count
+    finally:
+        db.close()
+
+
+def export_games(db_path, games, out_dir, fmt="svg", square_size=SQUARE_SIZE, processes=None):
+    os.makedirs(out_dir, exist_ok=True)
+    with ProcessPoolExecutor(processes) as pool:
+        jobs = [pool.submit(export_game, db_path, game, out_dir, fmt, square_size) for game in games]
+        return sum(job.result() for job in jobs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exports archived games as SVG or PNG frames.")
+    parser.add_argument("db", help="game database path (without extension)")
+    parser.add_argument("games", type=int, nargs="+")
+    parser.add_argument("--out", default="frames")
+    parser.add_argument("--format", choices=["svg", "png"], default="svg")
+    parser.add_argument("--square-size", type=int, default=SQUARE_SIZE)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+    total = export_games(args.db, args.games, args.out, args.format, args.square_size, args.processes)
+    print(f"{total} quadros exportados em {args.out}")
@@ -0,0 +1,5 @@
+import import_budget
+
+
+def test_every_module_within_budget():
+    assert import_budget.check(sorted(import_budget.BUDGETS_MS)) == 0
@@ -0,0 +1,227 @@
+"""Bot tournaments with Elo ratings.
+
+Entrants are bot strategies (see STRATEGIES). Each table seats four of them and
+is played once per seat rotation, so nobody keeps the first-move advantage.
+Round-robin plays every table of four entrants; Swiss plays `--rounds` rounds,
+seating entrants of similar rating together. Games run on a process pool in
+batches, each with a seed derived from the tournament seed and its game id, so
+results do not depend on which worker played them.
+
+Every result is appended to a JSONL log as it arrives, after a first line that
+records the seed, entrants and games per rotation. Ratings are updated in game
+id order, and re-running with the same log skips the games already in it,
+which resumes an interrupted tournament with identical ratings. A log of a
+different tournament is refused, and a last line cut off mid-write is dropped
+(its game is played again).
+
+    python tournament.py random greedy expectimax first --log results.jsonl --workers 8
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from engine import GameLogic
+from bitboard import STEP_OF_POSITION, HOME_STEP
+import bots
+
+STRATEGIES = {
+    "first": lambda game, rng: game.movable_pawns[0],
+    "random": lambda game, rng: rng.choice(game.movable_pawns),
+    "greedy": lambda game, rng: bots.greedy_choice(game),
+    "expectimax": lambda game, rng: bots.search_choice(game, math.inf, max_depth=1),
+}
+
+ELO_K = 24
+INITIAL_RATING = 1500
+MAX_TURNS = 5000
+
+
+def game_seed(base_seed, game_id):
+    return random.Random(f"{base_seed}:{game_id}").getrandbits(32)
+
+
+def play_game(game_id, seats, seed):
+    """Plays one game with `seats[i]` (a strategy name) on COLORS[i]. Seats are ranked winner first, then by progress."""
+    game = GameLogic(seed)
+    # A stream of its own: seeded like the dice, the random strategy's picks would follow the rolls.
+    rng = random.Random(f"{seed}:choices")
+    choosers = dict(zip(game.player_order, (STRATEGIES[name] for name in seats)))
+    winner = None
+    turns = 0
+    while winner is None and turns < MAX_TURNS:
+        turns += 1
+        player = game.get_current_player()
+        game.roll_dice(publish=False)
+        if game.movable_pawns:
+            game.move_pawn(choosers[player.color](game, rng), publish=False)
+            if game.check_win_condition(player):
+                winner = player.color
+                break
+        game.advance_turn(publish=False)
+
+    def progress(color):
+        return sum(STEP_OF_POSITION[color][pawn.position] - HOME_STEP for pawn in game.players[color].pawns)
+
+    order = sorted(range(len(seats)), key=lambda seat: (game.player_order[seat] != winner, -progress(game.player_order[seat])))
+    return {"game_id": game_id, "seats": list(seats), "placings": order, "turns": turns, "seed": seed}
+
+
+def play_batch(jobs):
+    return [play_game(*job) for job in jobs]
+
+
+class EloRatings:
+    """Multiplayer Elo: every game counts as one pairwise match between each two seats."""
+
+    def __init__(self, entrants):
+        self.ratings = {name: float(INITIAL_RATING) for name in entrants}
+        self.games = {name: 0 for name in entrants}
+
+    def update(self, result):
+        seats = result["seats"]
+        ranked = [seats[seat] for seat in result["placings"]]
+        k = ELO_K / (len(ranked) - 1)
+        deltas = dict.fromkeys(ranked, 0.0)
+        for upper, lower in itertools.combinations(ranked, 2):
+            if upper == lower:
+                continue
+            expected = 1 / (1 + 10 ** ((self.ratings[lower] - self.ratings[upper]) / 400))
+            deltas[upper] += k * (1 - expected)
+            deltas[lower] -= k * (1 - expected)
+        for name, delta in deltas.items():
+            self.ratings[name] += delta
+        for name in seats:
+            self.games[name] += 1
+
+    def standings(self):
+        return sorted(self.ratings.items(), key=lambda item: -item[1])
+
+
+def rotations(table):
+    return [tuple(table[i:] + table[:i]) for i in range(len(table))]
+
+
+def round_robin_tables(entrants):
+    if len(entrants) >= 4:
+        return [list(table) for table in itertools.combinations(entrants, 4)]
+    # Fewer than four entrants: fill tables with repeats, but never seat one entrant alone.
+    return [list(table) for table in itertools.combinations_with_replacement(entrants, 4) if len(set(table)) > 1]
+
+
+def swiss_tables(ratings, entrants):
+    ranked = sorted(entrants, key=lambda name: -ratings.ratings[name])
+    tables = [ranked[i:i + 4] for i in range(0, len(ranked), 4)]
+    if len(tables[-1]) < 4:
+        # The bottom table is topped up with the entrants just above it.
+        tables[-1] = ranked[-4:] if len(ranked) >= 4 else (ranked * 4)[:4]
+    return tables
+
+
+class Tournament:
+    def __init__(self, entrants, log_path, seed=0, games_per_rotation=1, workers=None, batch_size=16):
+        self.entrants = list(entrants)
+        self.log_path = log_path
+        self.seed = seed
+        self.games_per_rotation = games_per_rotation
+        self.workers = workers or os.cpu_count()
+        self.batch_size = batch_size
+        self.ratings = EloRatings(self.entrants)
+        self.completed = {}
+        self.next_to_apply = 0
+        self._load_log()
+
+    def _load_log(self):
+        header = {"seed": self.seed, "entrants": self.entrants, "games_per_rotation": self.games_per_rotation}
+        with open(self.log_path, "ab+") as log:
+            log.seek(0)
+            logged_header = None
+            kept = 0
+            for line in log:
+                if not line.endswith(b"\n"):
+                    break
+                kept += len(line)
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "tournament" in record:
+                    logged_header = record["tournament"]
+                else:
+                    self.completed[record["game_id"]] = record
+            if kept and logged_header != header:
+                raise ValueError(f"O log {self.log_path} é de outro torneio ({logged_header}), não de {header}.")
+            # Drops a line cut off mid-write, so the next result starts on a line of its own.
+            log.truncate(kept)
+            if not kept:
+                log.write((json.dumps({"tournament": header}) + "\n").encode())
+
+    def _schedule(self, tables, first_game_id):
+        jobs = []
+        game_id = first_game_id
+        for table in tables:
+            for seats in rotations(table):
+                for _ in range(self.games_per_rotation):
+                    jobs.append((game_id, seats, game_seed(self.seed, game_id)))
+                    game_id += 1
+        return jobs
+
+    def _apply_ready(self, until):
+        # Ratings depend on update order, so results are applied strictly by game id.
+        while self.next_to_apply < until and self.next_to_apply in self.completed:
+            self.ratings.update(self.completed[self.next_to_apply])
+            self.next_to_apply += 1
+
+    def _run_jobs(self, pool, jobs):
+        pending = [job for job in jobs if job[0] not in self.completed]
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        futures = [pool.submit(play_batch, batch) for batch in batches]
+        until = jobs[-1][0] + 1 if jobs else self.next_to_apply
+        with open(self.log_path, "a") as log:
+            for future in as_completed(futures):
+                for result in future.result():
+                    log.write(json.dumps(result) + "\n")
+                    self.completed[result["game_id"]] = result
+                log.flush()
+                self._apply_ready(until)
+        self._apply_ready(until)
+
+    def run_round_robin(self):
+        jobs = self._schedule(round_robin_tables(self.entrants), 0)
+        with ProcessPoolExecutor(self.workers) as pool:
+            self._run_jobs(pool, jobs)
+        return self.ratings
+
+    def run_swiss(self, rounds):
+        game_id = 0
+        with ProcessPoolExecutor(self.workers) as pool:
+            for _ in range(rounds):
+                # Pairings use the ratings after all earlier rounds, which the log replays identically.
+                jobs = self._schedule(swiss_tables(self.ratings, self.entrants), game_id)
+                self._run_jobs(pool, jobs)
+                game_id += len(jobs)
+        return self.ratings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Torneio entre estratégias de bots.")
+    parser.add_argument("entrants", nargs="+", choices=sorted(STRATEGIES))
+    parser.add_argument("--log", default="tournament.jsonl")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=["round-robin", "swiss"], default="round-robin")
+    parser.add_argument("--rounds", type=int, default=5, help="rodadas do sistema suíço")
+    parser.add_argument("--games", type=int, default=10, help="partidas por rotação de assentos")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    try:
+        tournament = Tournament(args.entrants, args.log, args.seed, args.games, args.workers, args.batch_size)
+    except ValueError as error:
+        parser.error(str(error))
+    ratings = tournament.run_swiss(args.rounds) if args.format == "swiss" else tournament.run_round_robin()
+    for name, rating in ratings.standings():
+        print(f"{name:12s} {rating:7.1f}  ({ratings.games[name]} partidas)")
@@ -0,0 +1,351 @@
+"""House-rule variants compiled into lookup tables.
+
+A VariantSpec lists the rule changes. `compile_variant` turns it into
+per-colour tables indexed by track step (see bitboard.py) and dice value, once,
+and VariantGameLogic only reads those tables: move generation, destinations
+and moves do the same work for every variant. Rules that need extra work
+(blocks, capture counts) get it through methods picked once per game, so the
+others don't pay for it. Against the reference GameLogic, move generation
+costs about a third to two thirds and a move/unmake pair at most about 0.9×.
+`--bench` exits with status 1 when any engine costs more than `--tolerance`
+(default 1.05) times GameLogic on either measure.
+
+* entry_rolls - dice values that take a pawn out of home. A roll of n lands
+  n - 1 squares past the start square, so 6 reproduces the default entry.
+* exact_finish - when False, a roll past the centre still finishes.
+* stacked_blocks - two pawns of one colour on a main path square form a block
+  that opponents can neither pass nor land on. Landing on an own pawn, which
+  the default rules forbid off the safe squares, is what builds a block.
+* max_sixes - rolling this many sixes in a row forfeits the turn. Counted by
+  roll_dice, so it only applies to games that roll through it.
+* capture_to_enter_home - a colour's pawns keep circling the main path until
+  that colour has captured a pawn.
+
+    python variants.py --bench --positions 1000
+"""
+
+import argparse
+import functools
+import gc
+import math
+import random
+import sys
+import time
+from collections import namedtuple
+
+from engine import COLORS, START_PATH_INDEX, GameLogic
+from bitboard import PATH_LENGTH, FINISH_STEP, HOME_STEP, SAFE_MASK, POSITION_OF_STEP, STEP_OF_POSITION, BitboardGameLogic
+
+VariantSpec = namedtuple("VariantSpec", ["entry_rolls", "exact_finish", "stacked_blocks", "max_sixes", "capture_to_enter_home"])
+DEFAULT_SPEC = VariantSpec(entry_rolls=(6,), exact_finish=True, stacked_blocks=False, max_sixes=None, capture_to_enter_home=False)
+
+VARIANTS = {
+    "default": DEFAULT_SPEC,
+    "exit-on-1-or-6": DEFAULT_SPEC._replace(entry_rolls=(1, 6)),
+    "no-exact-finish": DEFAULT_SPEC._replace(exact_finish=False),
+    "blocks": DEFAULT_SPEC._replace(stacked_blocks=True),
+    "three-sixes": DEFAULT_SPEC._replace(max_sixes=3),
+    "capture-to-enter": DEFAULT_SPEC._replace(capture_to_enter_home=True),
+    "house": VariantSpec(entry_rolls=(1, 6), exact_finish=False, stacked_blocks=True, max_sixes=3, capture_to_enter_home=True),
+}
+
+# Tables are indexed by step + 1, so the home step (-1) is row 0, and by dice value (column 0 unused).
+# destinations[unlocked][color][row][dice] -> logical position or None (what _calculate_destination returns)
+# moves[unlocked][color][row][dice] -> (destination step, mask of main squares entered) or None if not movable
+# landing_bits[color][step] -> bit of the square a pawn may not land on when an own pawn is there
+# `unlocked` is whether the colour may enter its home stretch (see capture_to_enter_home).
+CompiledVariant = namedtuple("CompiledVariant", ["spec", "destinations", "moves", "landing_bits", "max_sixes"])
+
+
+def _square_bit(color, step):
+    return 1 << ((START_PATH_INDEX[color] + step) % PATH_LENGTH) if 0 <= step < PATH_LENGTH else 0
+
+
+# Indexed by step + 1. SQUARE_BITS are main path squares only, CAPTURE_BITS the non-safe ones among them;
+# OCCUPANCY_BITS follow BitboardGameLogic.occupancy, which also has the colour's home stretch at bits 52-57.
+SQUARE_BITS = {color: [_square_bit(color, step) for step in range(HOME_STEP, FINISH_STEP + 1)] for color in COLORS}
+CAPTURE_BITS = {color: [bit & ~SAFE_MASK for bit in bits] for color, bits in SQUARE_BITS.items()}
+OCCUPANCY_BITS = {
+    color: [bit or (1 << step if PATH_LENGTH <= step < FINISH_STEP else 0) for step, bit in enumerate(bits, HOME_STEP)]
+    for color, bits in SQUARE_BITS.items()
+}
+
+
+def _destination_step(spec, step, dice, unlocked):
+    if step == HOME_STEP:
+        return dice - 1 if dice in spec.entry_rolls else None
+    if step == FINISH_STEP:
+        # The reference walker stays on "finished" for a single step.
+        return FINISH_STEP if dice == 1 else None
+    target = step + dice
+    if not unlocked and step < PATH_LENGTH <= target:
+        return target - PATH_LENGTH
+    if target > FINISH_STEP:
+        return FINISH_STEP if not spec.exact_finish else None
+    return target
+
+
+def _entered_steps(step, destination):
+    if step == HOME_STEP:
+        return range(0, destination + 1)
+    if destination < step:
+        return [s % PATH_LENGTH for s in range(step + 1, destination + PATH_LENGTH + 1)]
+    return range(step + 1, destination + 1)
+
+
+def _compile_tables(spec, unlocked):
+    destinations, moves = {}, {}
+    for color in COLORS:
+        destination_rows, move_rows = [], []
+        for step in range(HOME_STEP, FINISH_STEP + 1):
+            destination_row, move_row = [None], [None]
+            for dice in range(1, 7):
+                destination = _destination_step(spec, step, dice, unlocked)
+                destination_row.append(None if destination is None else POSITION_OF_STEP[color][destination])
+                if destination is None or step == FINISH_STEP:
+                    move_row.append(None)
+                    continue
+                entered = 0
+                if spec.stacked_blocks:
+                    for entered_step in _entered_steps(step, destination):
+                        entered |= _square_bit(color, entered_step)
+                move_row.append((destination, entered))
+            destination_rows.append(destination_row)
+            move_rows.append(move_row)
+        destinations[color] = destination_rows
+        moves[color] = move_rows
+    return destinations, moves
+
+
+def compile_variant(spec):
+    unlocked = _compile_tables(spec, True)
+    # Without the capture rule both halves are the same tables.
+    locked = _compile_tables(spec, False) if spec.capture_to_enter_home else unlocked
+    destinations = (locked[0], unlocked[0])
+    moves = (locked[1], unlocked[1])
+
+    landing_bits = {
+        color: [0 if spec.stacked_blocks else _square_bit(color, step) & ~SAFE_MASK for step in range(FINISH_STEP + 1)]
+        for color in COLORS
+    }
+    max_sixes = spec.max_sixes if spec.max_sixes is not None else math.inf
+    return CompiledVariant(spec, destinations, moves, landing_bits, max_sixes)
+
+
+class VariantGameLogic(BitboardGameLogic):
+    """Rules engine for one VariantSpec.
+
+    Work that only some rules need is chosen once here rather than tested on every
+    move: opponents' blocks are looked for only with stacked_blocks, and captures are
+    counted only with capture_to_enter_home, so the default rules pay for neither.
+    """
+
+    def __init__(self, seed=None, spec=DEFAULT_SPEC):
+        self.rules = compile_variant(spec)
+        self.captures = {color: 0 for color in COLORS}
+        self.sixes_in_row = 0
+        # The tables each colour moves by. Only capture_to_enter_home switches them, when a
+        # colour's capture count goes from 0 to 1 or back.
+        unlocked = not spec.capture_to_enter_home
+        self.move_tables = {color: self.rules.moves[unlocked][color] for color in COLORS}
+        self.destination_tables = {color: self.rules.destinations[unlocked][color] for color in COLORS}
+        if spec.capture_to_enter_home:
+            self.move_pawn = self._move_pawn_counting_captures
+            self.unmake = self._unmake_counting_captures
+        if spec.stacked_blocks:
+            self._get_valid_moves = self._get_valid_moves_with_blocks
+        super().__init__(seed)
+
+    def _place(self, pawn, position):
+        # Replaces BitboardGameLogic._place, which rescans all four pawns to rebuild the occupancy:
+        # only the pawn's old and new steps can change it. GameLogic._place only sets the position.
+        pawn.position = position
+        color = pawn.color
+        steps = self.steps[color]
+        old_step = steps[pawn.pawn_id]
+        new_step = steps[pawn.pawn_id] = STEP_OF_POSITION[color][position]
+        occupancy = self.occupancy[color]
+        if old_step not in steps:
+            occupancy &= ~OCCUPANCY_BITS[color][old_step + 1]
+        self.occupancy[color] = occupancy | OCCUPANCY_BITS[color][new_step + 1]
+
+    def roll_dice(self, publish=True):
+        self.dice_roll = int(self.rng.random() * 6) + 1
+        self.sixes_in_row = self.sixes_in_row + 1 if self.dice_roll == 6 else 0
+        player = self.get_current_player()
+        forfeited = self.sixes_in_row >= self.rules.max_sixes
+        self.movable_pawns = [] if forfeited else self._get_valid_moves(player, self.dice_roll)
+        if publish:
+            self._publish()
+            if self.listeners:
+                self._emit("dice_rolled", color=player.color, value=self.dice_roll, movable_pawns=self.snapshot.movable_pawns)
+        return self.dice_roll, self.movable_pawns
+
+    def advance_turn(self, publish=True):
+        if self.dice_roll == 6 and self.sixes_in_row < self.rules.max_sixes:
+            return True
+        self.sixes_in_row = 0
+        self.next_player(publish)
+        return False
+
+    def _get_valid_moves(self, player, dice_roll, blocked=0):
+        color = player.color
+        moves = self.move_tables[color]
+        landing_bits = self.rules.landing_bits[color]
+        own = self.occupancy[color]
+        valid_pawns = []
+        for pawn, step in zip(player.pawns, self.steps[color]):
+            move = moves[step + 1][dice_roll]
+            if move is not None and not (landing_bits[move[0]] & own or move[1] & blocked):
+                valid_pawns.append(pawn)
+        return valid_pawns
+
+    def _get_valid_moves_with_blocks(self, player, dice_roll):
+        # Blocks are found here, from the opponents' steps, rather than kept up to date by
+        # every _place: a move then costs the same as under the default rules.
+        blocked = 0
+        for other_color in COLORS:
+            if other_color != player.color:
+                square_bits = SQUARE_BITS[other_color]
+                seen = 0
+                for step in self.steps[other_color]:
+                    bit = square_bits[step + 1]
+                    blocked |= seen & bit
+                    seen |= bit
+        return VariantGameLogic._get_valid_moves(self, player, dice_roll, blocked)
+
+    def _calculate_destination(self, pawn, steps):
+        return self.destination_tables[pawn.color][self.steps[pawn.color][pawn.pawn_id] + 1][steps]
+
+    def _find_capture(self, pawn):
+        # Same test as BitboardGameLogic's, from the pawn's step instead of its position tuple.
+        square_bit = CAPTURE_BITS[pawn.color][self.steps[pawn.color][pawn.pawn_id] + 1]
+        if square_bit:
+            for other_color in COLORS:
+                if other_color != pawn.color and self.occupancy[other_color] & square_bit:
+                    for other_pawn in self.players[other_color].pawns:
+                        if other_pawn.position == pawn.position:
+                            return other_pawn
+        return None
+
+    def _count_capture(self, color, delta):
+        self.captures[color] += delta
+        unlocked = self.captures[color] > 0
+        self.move_tables[color] = self.rules.moves[unlocked][color]
+        self.destination_tables[color] = self.rules.destinations[unlocked][color]
+
+    def _move_pawn_counting_captures(self, pawn, publish=True):
+        record = GameLogic.move_pawn(self, pawn, publish)
+        if record.captured_pawn is not None:
+            self._count_capture(pawn.color, 1)
+        return record
+
+    def _unmake_counting_captures(self, record, publish=True):
+        if record.captured_pawn is not None:
+            self._count_capture(record.pawn.color, -1)
+        GameLogic.unmake(self, record, publish)
+
+
+def sample_positions(num_positions, seed=0):
+    """Snapshots taken every few turns of random-choice games under the default rules."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < num_positions:
+        game = GameLogic(rng.getrandbits(32))
+        for turn in range(5000):
+            player = game.get_current_player()
+            game.roll_dice(publish=False)
+            if game.movable_pawns:
+                game.move_pawn(rng.choice(game.movable_pawns), publish=False)
+                if game.check_win_condition(player):
+                    break
+            game.advance_turn(publish=False)
+            if turn % 7 == 0:
+                game._publish()
+                positions.append(game.snapshot)
+    return positions[:num_positions]
+
+
+def benchmark(num_positions=1000, seed=0, repeat=9, chunk_size=50):
+    """Times the rules hot path on the same positions for every engine.
+
+    Returns {engine: (µs per move generation, µs per move)}. A move generation is
+    _get_valid_moves plus _calculate_destination of the player's four pawns, for each
+    position and dice value; a move is one move_pawn/unmake pair. Variants allow different
+    numbers of moves, so the two are timed separately. Engines take turns within every
+    repetition, so machine noise hits them alike. The work is timed in chunks of
+    `chunk_size` positions and the best repetition of each chunk is kept, so a burst of
+    noise only spoils the chunks it lands on.
+    """
+    import bots
+
+    positions = sample_positions(num_positions, seed)
+    engines = {"GameLogic": GameLogic, "bitboard": BitboardGameLogic}
+    engines.update((f"variant:{name}", functools.partial(VariantGameLogic, spec=spec)) for name, spec in VARIANTS.items())
+    workloads = {}
+    for name, engine in engines.items():
+        games = [bots.game_from_snapshot(snapshot, engine) for snapshot in positions]
+        chunks = [games[start:start + chunk_size] for start in range(0, len(games), chunk_size)]
+        workloads[name] = [(chunk, [(game, dice, pawn) for game in chunk for dice in range(1, 7)
+                                    for pawn in game._get_valid_moves(game.get_current_player(), dice)])
+                           for chunk in chunks]
+
+    def generate(games):
+        for game in games:
+            player = game.get_current_player()
+            for dice in range(1, 7):
+                for pawn in player.pawns:
+                    game._calculate_destination(pawn, dice)
+                game._get_valid_moves(player, dice)
+
+    def move(moves):
+        for game, dice, pawn in moves:
+            game.dice_roll = dice
+            game.unmake(game.move_pawn(pawn, publish=False), publish=False)
+
+    best = {name: [[math.inf, math.inf] for _ in chunks] for name, chunks in workloads.items()}
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for name, chunks in workloads.items():
+                for chunk_best, (games, moves) in zip(best[name], chunks):
+                    for slot, (run, work) in enumerate(((generate, games), (move, moves))):
+                        started = time.perf_counter()
+                        run(work)
+                        chunk_best[slot] = min(chunk_best[slot], time.perf_counter() - started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    results = {}
+    for name, chunks in workloads.items():
+        generations = sum(len(games) for games, _ in chunks) * 6
+        moves = sum(len(moves) for _, moves in chunks)
+        results[name] = (sum(generate for generate, _ in best[name]) / generations * 1e6,
+                         sum(move for _, move in best[name]) / max(1, moves) * 1e6)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Variantes de regras do Ludo.")
+    parser.add_argument("--bench", action="store_true", help="mede o custo das regras de cada variante")
+    parser.add_argument("--positions", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=1.05, help="razão máxima sobre o GameLogic em geração ou jogada")
+    args = parser.parse_args()
+
+    if args.bench:
+        results = benchmark(args.positions, args.seed)
+        base_generate, base_move = results["GameLogic"]
+        failures = 0
+        print(f"      {'':28s} {'geração':>17s} {'jogada':>17s}")
+        for name, (generate, move) in results.items():
+            ok = max(generate / base_generate, move / base_move) <= args.tolerance
+            failures += not ok
+            print(f"{'ok   ' if ok else 'FALHA'} {name:28s} {generate:7.2f} µs ({generate / base_generate:4.2f}×)"
+                  f" {move:7.2f} µs ({move / base_move:4.2f}×)")
+        print(f"limite: {args.tolerance:g}× o GameLogic")
+        sys.exit(1 if failures else 0)
+    else:
+        for name, spec in VARIANTS.items():
+            print(f"{name:20s} {spec}")